@@ -2,17 +2,16 @@
 
 from __future__ import annotations
 
-import argparse
-import json
+import functools
 import logging
+import os
 import sys
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import yaml
-from importlib import resources
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from . import json_utils
 from .command_bridge import CommandBridge, CommandRequest
 from .logging_utils import StructuredLogWriter
 from .safety import SafetyConfig, SafetyEvaluator
@@ -24,18 +23,45 @@ from .session_manager import (
 )
 from .ssh_config import SSHHostConfig, load_ssh_config
 
+if TYPE_CHECKING:
+    import argparse
+
 DEFAULT_SESSION = "cursor-shared"
 DEFAULT_WINDOW = "agent"
 DEFAULT_PANE = "0"
+DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_LOG_PATH = "logs/agent_activity.log"
 PROTOCOL_VERSION = "2024-11-05"
+STDIN_CHUNK_SIZE = 65536
 
 
 CONFIG_PACKAGE = "tmux_mcp.config"
 FEATURE_FLAGS_RESOURCE = "feature-flags.yaml"
 CAPABILITIES_RESOURCE = "capabilities.json"
 
+_CLI_FLAGS = {
+    "--log-level": "log_level",
+    "--session": "session",
+    "--window": "window",
+    "--pane": "pane",
+    "--log": "log",
+}
+
 LOGGER = logging.getLogger(__name__)
 
+_ERROR_TEMPLATE = b'{"jsonrpc":"2.0","id":%b,"error":{"code":%d,"message":%b}}'
+# Arguments each tool reads unconditionally. They are checked before the tool
+# runs so a missing one is reported without raising and unwinding a KeyError.
+_REQUIRED_ARGUMENTS: Dict[str, Tuple[str, ...]] = {
+    "connect_session": ("profile",),
+    "submit_command": ("task_id", "command"),
+    "approve_command": ("command_id",),
+    "reject_command": ("command_id",),
+    "upsert_profile": ("profile",),
+    "delete_profile": ("name",),
+}
+
+
 @dataclass(slots=True)
 class ToolDefinition:
     name: str
@@ -54,9 +80,72 @@ class ToolDefinition:
         return payload
 
 
+@dataclass(slots=True)
+class _RpcError:
+    code: int
+    message: str
+
+
+@dataclass(slots=True)
+class _ToolResult:
+    """A tool result together with its JSON encoding.
+
+    The encoding is needed for the text content anyway, so the byte path
+    splices it in as ``structuredOutput`` instead of serialising it again.
+    """
+
+    value: Any
+    encoded: bytes
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            "content": [
+                {"type": "text", "text": self.encoded.decode("utf-8")},
+            ],
+            "structuredOutput": self.value,
+            "isError": False,
+        }
+
+    def to_bytes(self) -> bytes:
+        return (
+            b'{"content":[{"type":"text","text":'
+            + json_utils.dumps(self.encoded.decode("utf-8"))
+            + b'}],"structuredOutput":'
+            + self.encoded
+            + b',"isError":false}'
+        )
+
+
 class MCPAgentServer:
     """JSON-RPC handler that satisfies the MCP surface expected by Cursor."""
 
+    __slots__ = (
+        "command_bridge",
+        "session_manager",
+        "profile_store",
+        "safety",
+        "default_session",
+        "default_window",
+        "default_pane",
+        "server_info",
+        "tools",
+        "prompts",
+        "resources",
+        "ssh_hosts",
+        "_client_info",
+        "_initialized",
+        "_handlers",
+        "_tool_routes",
+        "_initialize_payload",
+        "_tools_payload",
+        "_prompts_payload",
+        "_resources_payload",
+        "_resource_templates_payload",
+        "_encoded_results",
+        "_stdout_fd",
+        "_host_defaults",
+    )
+
     def __init__(
         self,
         *,
@@ -85,8 +174,36 @@ class MCPAgentServer:
         self.prompts = prompts
         self.resources = resources
         self.ssh_hosts = ssh_hosts
+        self._host_defaults = {
+            alias: _profile_defaults(host) for alias, host in ssh_hosts.items()
+        }
         self._client_info: Dict[str, Any] = {}
         self._initialized = False
+        self._stdout_fd: Optional[int] = None
+        # Listing results only depend on construction arguments, so build them once.
+        self._initialize_payload = {
+            "protocolVersion": PROTOCOL_VERSION,
+            "serverInfo": server_info,
+            "capabilities": {
+                "tools": {"list": True, "call": True},
+                "prompts": {"list": True},
+                "resources": {"list": True},
+            },
+        }
+        self._tools_payload = {"tools": [tool.to_payload() for tool in tools]}
+        self._prompts_payload = {"prompts": prompts}
+        self._resources_payload = {"resources": resources}
+        self._resource_templates_payload: Dict[str, Any] = {"resourceTemplates": []}
+        self._encoded_results = {
+            "tools/list": json_utils.dumps(self._tools_payload),
+            "prompts/list": json_utils.dumps(self._prompts_payload),
+            "resources/list": json_utils.dumps(self._resources_payload),
+            "resources/templates/list": json_utils.dumps(
+                self._resource_templates_payload
+            ),
+        }
+        # A single hashed lookup outperforms a match/case chain of string
+        # comparisons for these method and tool names, so keep dict dispatch.
         self._handlers = {
             "initialize": self._handle_initialize,
             "initialized": self._handle_initialized,
@@ -109,36 +226,125 @@ class MCPAgentServer:
         }
 
     def serve_forever(self) -> None:
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
+        stdin_fd = sys.stdin.buffer
+        self._stdout_fd = sys.stdout.buffer.fileno()
+        buf = bytearray()
+        while True:
+            chunk = stdin_fd.read1(STDIN_CHUNK_SIZE)
+            if not chunk:
+                break
+            buf.extend(chunk)
+            # Answer the complete requests in this chunk with as few writes as
+            # possible; whatever has been answered is flushed even if a later
+            # line raises.
+            responses: List[bytes] = []
             try:
-                message = json.loads(line)
-            except json.JSONDecodeError as exc:
-                # If JSON parsing fails there is no request id, so we skip emitting an error.
-                continue
-            response = self.handle_request(message)
-            if response is not None:
-                sys.stdout.write(json.dumps(response) + "\n")
-                sys.stdout.flush()
+                while (nl := buf.find(b"\n")) != -1:
+                    message = self._parse_line(bytes(buf[:nl]))
+                    del buf[: nl + 1]
+                    if message is None:
+                        continue
+                    if responses and _may_block(message):
+                        # Do not hold earlier answers back behind a tool call.
+                        self._write_messages(responses)
+                        responses = []
+                    encoded = self.handle_request_bytes(message)
+                    if encoded is not None:
+                        responses.append(encoded)
+            finally:
+                if responses:
+                    self._write_messages(responses)
+        if buf:
+            encoded = self._process_line(bytes(buf))
+            if encoded is not None:
+                self._write_messages([encoded])
+
+    def _process_line(self, line: bytes) -> Optional[bytes]:
+        message = self._parse_line(line)
+        if message is None:
+            return None
+        return self.handle_request_bytes(message)
+
+    def _parse_line(self, line: bytes) -> Optional[Any]:
+        # Both JSON decoders skip surrounding whitespace (including a trailing
+        # "\r"), so the line is only inspected, never copied by strip().
+        if not line or line.isspace():
+            return None
+        try:
+            return json_utils.loads(line)
+        except (json_utils.JSONDecodeError, UnicodeDecodeError):
+            # If JSON parsing fails there is no request id, so we skip emitting an error.
+            return None
+
+    def _write_messages(self, payloads: List[bytes]) -> None:
+        fd = self._stdout_fd
+        if fd is None:
+            fd = self._stdout_fd = sys.stdout.buffer.fileno()
+        body = payloads[0] if len(payloads) == 1 else b"\n".join(payloads)
+        written = os.writev(fd, (body, b"\n"))
+        if written < len(body) + 1:
+            # A pipe may accept only part of a large response; send the rest.
+            remaining = memoryview(body + b"\n")[written:]
+            while remaining:
+                remaining = remaining[os.write(fd, remaining) :]
+
+    def handle_request_bytes(self, message: Dict[str, Any]) -> Optional[bytes]:
+        """Like :meth:`handle_request` but returns the encoded JSON response.
+
+        Listing methods splice their pre-encoded result into the envelope so
+        the (potentially large) tool schemas are not serialised per request.
+        """
+
+        request_id = message.get("id")
+        if request_id is not None and "error" not in message:
+            cached = self._encoded_results.get(message.get("method"))
+            if cached is not None:
+                return _wrap_result(request_id, cached)
+        outcome = self._dispatch(message)
+        if outcome is None:
+            return None
+        request_id, result = outcome
+        if isinstance(result, _RpcError):
+            return self._build_error_bytes(
+                request_id, code=result.code, message=result.message
+            )
+        if isinstance(result, _ToolResult):
+            return _wrap_result(request_id, result.to_bytes())
+        return json_utils.dumps({"jsonrpc": "2.0", "id": request_id, "result": result})
 
     def handle_request(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        outcome = self._dispatch(message)
+        if outcome is None:
+            return None
+        request_id, result = outcome
+        if isinstance(result, _RpcError):
+            return self._build_error(
+                request_id, code=result.code, message=result.message
+            )
+        if isinstance(result, _ToolResult):
+            result = result.to_payload()
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def _dispatch(self, message: Dict[str, Any]) -> Optional[Tuple[Any, Any]]:
+        """Run the handler for *message* and return ``(request_id, result)``.
+
+        ``result`` is an :class:`_RpcError` when the request failed, either
+        raised as an exception or returned by the handler. ``None`` is
+        returned when no response should be sent.
+        """
+
         if "error" in message:
             return None
 
         method = message.get("method")
-        request_id = message.get("id")
-
         if method is None:
             return None
 
+        request_id = message.get("id")
         handler = self._handlers.get(method)
         if handler is None:
             if request_id is not None:
-                return self._build_error(
-                    request_id, code=-32601, message=f"Unknown method: {method}"
-                )
+                return request_id, _RpcError(-32601, f"Unknown method: {method}")
             return None
 
         params = message.get("params", {})
@@ -147,36 +353,31 @@ class MCPAgentServer:
         except SessionError as exc:
             LOGGER.warning("Session error during '%s': %s", method, exc)
             if request_id is not None:
-                return self._build_error(request_id, code=4001, message=str(exc))
+                return request_id, _RpcError(4001, str(exc))
             return None
         except KeyError as exc:
             LOGGER.warning("Missing key for method '%s': %s", method, exc)
             if request_id is not None:
-                return self._build_error(
-                    request_id, code=4002, message=f"Missing key: {exc}"
-                )
+                return request_id, _RpcError(4002, f"Missing key: {exc}")
             return None
         except Exception as exc:
             LOGGER.exception("Unhandled error in method '%s'", method)
             if request_id is not None:
-                return self._build_error(request_id, code=5000, message=str(exc))
+                return request_id, _RpcError(5000, str(exc))
             return None
 
-        if request_id is None:
+        if request_id is None or method == "initialized":
             return None
 
-        if method == "initialized":
-            return None
-
-        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return request_id, result
 
     def _emit_error(
         self, request_id: Optional[str], *, code: int, message: str
     ) -> None:
         if request_id is not None:
-            payload = self._build_error(request_id, code=code, message=message)
-            sys.stdout.write(json.dumps(payload) + "\n")
-            sys.stdout.flush()
+            self._write_messages(
+                [self._build_error_bytes(request_id, code=code, message=message)]
+            )
 
     def _build_error(
         self, request_id: Optional[str], *, code: int, message: str
@@ -191,20 +392,23 @@ class MCPAgentServer:
         }
         return payload
 
+    def _build_error_bytes(
+        self, request_id: Optional[str], *, code: int, message: str
+    ) -> bytes:
+        if request_id is None:
+            raise ValueError("Cannot build error response without valid request_id")
+        return _ERROR_TEMPLATE % (
+            json_utils.dumps(request_id),
+            code,
+            json_utils.dumps(message),
+        )
+
     # -- MCP lifecycle -------------------------------------------------
 
     def _handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
         self._client_info = params.get("clientInfo", {})
         self._initialized = True
-        return {
-            "protocolVersion": PROTOCOL_VERSION,
-            "serverInfo": self.server_info,
-            "capabilities": {
-                "tools": {"list": True, "call": True},
-                "prompts": {"list": True},
-                "resources": {"list": True},
-            },
-        }
+        return self._initialize_payload
 
     def _handle_initialized(self, _: Dict[str, Any]) -> None:
         return None
@@ -221,45 +425,44 @@ class MCPAgentServer:
 
     def _handle_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
         del params  # unused cursor pagination for now
-        return {"tools": [tool.to_payload() for tool in self.tools]}
+        return self._tools_payload
 
     def _handle_list_prompts(self, params: Dict[str, Any]) -> Dict[str, Any]:
         del params
-        return {"prompts": self.prompts}
+        return self._prompts_payload
 
     def _handle_list_resources(self, params: Dict[str, Any]) -> Dict[str, Any]:
         del params
-        return {"resources": self.resources}
+        return self._resources_payload
 
     def _handle_list_resource_templates(self, params: Dict[str, Any]) -> Dict[str, Any]:
         del params
-        return {"resourceTemplates": []}
+        return self._resource_templates_payload
 
     # -- Tool execution ------------------------------------------------
 
-    def _handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_call_tool(self, params: Dict[str, Any]) -> _ToolResult | _RpcError:
+        if "name" not in params:
+            return _missing_argument("tools/call", "name")
         name = params["name"]
         arguments = params.get("arguments", {})
         tool_handler = self._tool_routes.get(name)
         if tool_handler is None:
             raise SessionError(f"Unknown tool '{name}'")
-        result = tool_handler(arguments)
-        serialized = json.dumps(result)
-        payload = {
-            "content": [
-                {"type": "text", "text": serialized},
-            ],
-            "structuredOutput": result,
-            "structured": result,
-            "structured_output": result,
-            "isError": False,
-        }
-        LOGGER.info(
-            "Tool '%s' payload: %s",
-            name,
-            json.dumps(payload, default=str)[:2000],
-        )
-        return payload
+        for key in _REQUIRED_ARGUMENTS.get(name, ()):
+            if key not in arguments:
+                return _missing_argument(name, key)
+        value = tool_handler(arguments)
+        result = _ToolResult(value, json_utils.dumps(value))
+        if LOGGER.isEnabledFor(logging.INFO):
+            # Decode only the logged prefix; a cut multi-byte character is
+            # replaced rather than raising.
+            LOGGER.info(
+                "Tool '%s' result: %s",
+                name,
+                result.encoded[:2000].decode("utf-8", "replace"),
+            )
+        return result
 
     # -- Tool implementations -----------------------------------------
 
@@ -267,12 +470,13 @@ class MCPAgentServer:
         profile = params["profile"]
         session = params.get("session", self.default_session)
         window = params.get("window", self.default_window)
-        LOGGER.debug(
-            "Connecting session using profile='%s', session='%s', window='%s'",
-            profile,
-            session,
-            window,
-        )
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                "Connecting session using profile='%s', session='%s', window='%s'",
+                profile,
+                session,
+                window,
+            )
         self.session_manager.connect(profile, session_name=session, window_name=window)
         return {"status": "connected", "session": session, "window": window}
 
@@ -288,25 +492,19 @@ class MCPAgentServer:
         safe_mode_override = params.get("safe_mode")
         if force:
             safe_mode_override = False
-        old_safe_mode = self.safety.config.safe_mode
-        if safe_mode_override is not None:
-            self.safety.update_config(safe_mode=safe_mode_override)
-        try:
-            result = self.command_bridge.submit_command(
-                CommandRequest(
-                    command_id=command_id,
-                    task_id=task_id,
-                    session=session,
-                    window=window,
-                    pane=pane,
-                    command=command,
-                    metadata=metadata,
-                ),
-                approved=force,
-            )
-        finally:
-            if safe_mode_override is not None:
-                self.safety.update_config(safe_mode=old_safe_mode)
+        result = self.command_bridge.submit_command(
+            CommandRequest(
+                command_id=command_id,
+                task_id=task_id,
+                session=session,
+                window=window,
+                pane=pane,
+                command=command,
+                metadata=metadata,
+            ),
+            approved=force,
+            safe_mode=safe_mode_override,
+        )
         return {
             "command_id": command_id,
             "status": result.status,
@@ -352,13 +550,10 @@ class MCPAgentServer:
         return {"session": session, "window": window, "pane": pane, "context": context}
 
     def _tool_list_profiles(self, _: Dict[str, Any]) -> Dict[str, Any]:
-        profiles = [
-            asdict(profile) for profile in self.profile_store.list_profiles().values()
-        ]
-        return {"profiles": profiles}
+        return {"profiles": list(self.profile_store.list_profile_dicts().values())}
 
     def _tool_upsert_profile(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        profile_payload = dict(params["profile"])
+        profile_payload = params["profile"]
         profile_name = profile_payload.get("name")
         if not profile_name:
             raise SessionError("Profile name is required")
@@ -367,26 +562,18 @@ class MCPAgentServer:
             "host_alias"
         )
         alias = source_host or profile_name
-        host_config = self.ssh_hosts.get(alias)
+        overrides = {
+            key: value
+            for key, value in profile_payload.items()
+            if key not in ("host_alias", "source_host") and value not in (None, "")
+        }
+        merged_payload = self._host_defaults.get(alias, {}) | overrides
 
-        merged_payload = dict(profile_payload)
-        merged_payload.pop("host_alias", None)
-        merged_payload.pop("source_host", None)
-
-        if host_config is not None:
-            if not merged_payload.get("hostname") and host_config.hostname:
-                merged_payload["hostname"] = host_config.hostname
-            if not merged_payload.get("username") and host_config.username:
-                merged_payload["username"] = host_config.username
-            if merged_payload.get("port") in (None, "") and host_config.port:
-                merged_payload["port"] = host_config.port
-            if not merged_payload.get("identity_file") and host_config.identity_files:
-                merged_payload["identity_file"] = host_config.identity_files[0]
-            existing_options = merged_payload.get("ssh_options") or {}
-            merged_options = dict(host_config.options)
-            merged_options.update(existing_options)
-            if merged_options:
-                merged_payload["ssh_options"] = merged_options
+        host_config = self.ssh_hosts.get(alias)
+        if host_config is not None and host_config.options:
+            merged_payload["ssh_options"] = host_config.options | (
+                overrides.get("ssh_options") or {}
+            )
 
         port_value = merged_payload.get("port")
         if port_value not in (None, ""):
@@ -414,33 +601,76 @@ class MCPAgentServer:
         return {"status": "deleted", "profile": name}
 
 
+def _may_block(message: Any) -> bool:
+    """Return whether handling *message* can wait on a remote host."""
+
+    return isinstance(message, dict) and message.get("method") == "tools/call"
+
+
+def _wrap_result(request_id: Any, encoded_result: bytes) -> bytes:
+    return (
+        b'{"jsonrpc":"2.0","id":'
+        + json_utils.dumps(request_id)
+        + b',"result":'
+        + encoded_result
+        + b"}"
+    )
+
+
+def _missing_argument(target: str, key: str) -> _RpcError:
+    LOGGER.warning("Missing key for '%s': '%s'", target, key)
+    return _RpcError(4002, f"Missing key: '{key}'")
+
+
+def _profile_defaults(host: SSHHostConfig) -> Dict[str, Any]:
+    """Return the connection profile fields an SSH host alias can supply."""
+
+    defaults = {
+        "hostname": host.hostname,
+        "username": host.username,
+        "port": host.port,
+        "identity_file": host.identity_files[0] if host.identity_files else None,
+    }
+    return {key: value for key, value in defaults.items() if value}
+
+
+@functools.lru_cache(maxsize=None)
 def load_feature_flags(path: Optional[Path] = None) -> Dict[str, Any]:
+    # Imported lazily: these are only needed once, while building the server.
+    from importlib import resources
+
+    import yaml
+
+    # LibYAML's C loader is much faster; PyYAML may be built without it.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     if path is not None and path.exists():
-        with path.open("r", encoding="utf-8") as fh:
-            data = yaml.safe_load(fh) or {}
+        raw = path.read_bytes()
     else:
-        with resources.files(CONFIG_PACKAGE).joinpath(FEATURE_FLAGS_RESOURCE).open(
-            "r", encoding="utf-8"
-        ) as fh:
-            data = yaml.safe_load(fh) or {}
+        raw = (
+            resources.files(CONFIG_PACKAGE)
+            .joinpath(FEATURE_FLAGS_RESOURCE)
+            .read_bytes()
+        )
+    data = yaml.load(raw, Loader=loader) or {}
     if not isinstance(data, dict):
         raise ValueError("feature-flags file must contain a mapping")
     return data
 
 
+@functools.lru_cache(maxsize=None)
 def load_capabilities(
     path: Optional[Path] = None,
 ) -> tuple[
     Dict[str, Any], List[ToolDefinition], List[Dict[str, Any]], List[Dict[str, Any]]
 ]:
+    from importlib import resources
+
     if path is not None and path.exists():
-        with path.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        data = json_utils.loads(path.read_bytes())
     else:
-        with resources.files(CONFIG_PACKAGE).joinpath(CAPABILITIES_RESOURCE).open(
-            "r", encoding="utf-8"
-        ) as fh:
-            data = json.load(fh)
+        data = json_utils.loads(
+            resources.files(CONFIG_PACKAGE).joinpath(CAPABILITIES_RESOURCE).read_bytes()
+        )
     provider = data.get("provider", {})
     tools_payload = data.get("tools", [])
     prompts = data.get("prompts", [])
@@ -540,11 +770,13 @@ def build_server(
     )
 
 
-def main(argv: Optional[list[str]] = None) -> int:
+def _build_arg_parser() -> argparse.ArgumentParser:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Run the tmux MCP agent")
     parser.add_argument(
         "--log-level",
-        default="INFO",
+        default=DEFAULT_LOG_LEVEL,
         help="Logging verbosity (DEBUG, INFO, WARNING, ERROR)",
     )
     parser.add_argument(
@@ -557,9 +789,47 @@ def main(argv: Optional[list[str]] = None) -> int:
         "--pane", default=DEFAULT_PANE, help="Default tmux pane reference"
     )
     parser.add_argument(
-        "--log", default="logs/agent_activity.log", help="Structured log file path"
+        "--log", default=DEFAULT_LOG_PATH, help="Structured log file path"
     )
-    args = parser.parse_args(argv)
+    return parser
+
+
+def _parse_args_fast(argv: List[str]) -> Optional[SimpleNamespace]:
+    """Parse the plain ``--flag value`` / ``--flag=value`` forms without argparse.
+
+    Returns ``None`` for anything else (``--help``, unknown or abbreviated
+    flags, missing values) so that argparse can handle it and report errors.
+    """
+
+    values = {
+        "log_level": DEFAULT_LOG_LEVEL,
+        "session": DEFAULT_SESSION,
+        "window": DEFAULT_WINDOW,
+        "pane": DEFAULT_PANE,
+        "log": DEFAULT_LOG_PATH,
+    }
+    index = 0
+    while index < len(argv):
+        flag, has_value, value = argv[index].partition("=")
+        dest = _CLI_FLAGS.get(flag)
+        if dest is None:
+            return None
+        if not has_value:
+            index += 1
+            if index >= len(argv) or argv[index].startswith("-"):
+                return None
+            value = argv[index]
+        values[dest] = value
+        index += 1
+    return SimpleNamespace(**values)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    args = _parse_args_fast(argv)
+    if args is None:
+        args = _build_arg_parser().parse_args(argv)
 
     numeric_level = getattr(logging, args.log_level.upper(), logging.INFO)
     logging.basicConfig(level=numeric_level)
@@ -570,7 +840,10 @@ def main(argv: Optional[list[str]] = None) -> int:
         default_window=args.window,
         default_pane=args.pane,
     )
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    finally:
+        server.session_manager.shutdown()
     return 0
 
 
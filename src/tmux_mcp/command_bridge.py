@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import itertools
+import threading
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from .logging_utils import LogRecord, StructuredLogWriter
 from .safety import SafetyEvaluation, SafetyEvaluator
@@ -43,17 +44,26 @@ class CommandBridge:
         self.session_manager = session_manager
         self.safety = safety
         self.log_writer = log_writer
-        self._pending: Dict[str, CommandRequest] = {}
-        self._pane_snapshots: Dict[Tuple[str, str, str], str] = {}
+        self._pending: Dict[str, Tuple[CommandRequest, SafetyEvaluation]] = {}
+        self._pane_snapshots: Dict[Tuple[str, str, str], List[str]] = {}
         self._id_counter = itertools.count(1)
+        # next() on a count is only atomic under the GIL; the lock keeps ids
+        # unique on free-threaded builds too.
+        self._id_lock = threading.Lock()
 
     def next_command_id(self) -> str:
-        return f"cmd-{next(self._id_counter)}"
+        with self._id_lock:
+            number = next(self._id_counter)
+        return "cmd-" + str(number)
 
     def submit_command(
-        self, request: CommandRequest, *, approved: bool = False
+        self,
+        request: CommandRequest,
+        *,
+        approved: bool = False,
+        safe_mode: Optional[bool] = None,
     ) -> CommandResult:
-        evaluation = self.safety.evaluate(request.command)
+        evaluation = self.safety.evaluate(request.command, safe_mode=safe_mode)
         if evaluation.blocked:
             self._log(request, "blocked", evaluation, stdout="", approved=approved)
             return CommandResult(
@@ -64,7 +74,7 @@ class CommandBridge:
                 approved_by_user=approved,
             )
         if evaluation.requires_approval and not approved:
-            self._pending[request.command_id] = request
+            self._pending[request.command_id] = (request, evaluation)
             self._log(
                 request, "pending_approval", evaluation, stdout="", approved=False
             )
@@ -80,21 +90,18 @@ class CommandBridge:
     def execute_pending(
         self, command_id: str, *, approved_by_user: bool
     ) -> CommandResult:
-        request = self._pending.pop(command_id)
-        evaluation = self.safety.evaluate(request.command)
+        request, evaluation = self._pending.pop(command_id)
         return self._execute(request, evaluation, approved=approved_by_user)
 
     def reject_pending(self, command_id: str) -> None:
-        request = self._pending.pop(command_id)
-        evaluation = self.safety.evaluate(request.command)
+        request, evaluation = self._pending.pop(command_id)
         self._log(request, "denied", evaluation, stdout="", approved=False)
 
     def read_context(self, session: str, window: str, pane: str) -> str:
         pane_obj = self.session_manager.get_pane(session, window, pane)
         snapshot = pane_obj.capture_pane()
-        concatenated = "\n".join(snapshot)
-        self._pane_snapshots[(session, window, pane)] = concatenated
-        return concatenated
+        self._pane_snapshots[(session, window, pane)] = snapshot
+        return "\n".join(snapshot)
 
     def _execute(
         self, request: CommandRequest, evaluation: SafetyEvaluation, *, approved: bool
@@ -103,12 +110,11 @@ class CommandBridge:
             request.session, request.window, request.pane
         )
         key = (request.session, request.window, request.pane)
-        before_snapshot = self._pane_snapshots.get(key, "")
+        before_snapshot = self._pane_snapshots.get(key)
         if not before_snapshot:
-            before_snapshot = "\n".join(pane_obj.capture_pane())
+            before_snapshot = pane_obj.capture_pane()
         pane_obj.send_keys(request.command, enter=True)
-        after_snapshot_lines = pane_obj.capture_pane()
-        after_snapshot = "\n".join(after_snapshot_lines)
+        after_snapshot = pane_obj.capture_pane()
         delta = self._calculate_delta(before_snapshot, after_snapshot)
         self._pane_snapshots[key] = after_snapshot
         self._log(request, "executed", evaluation, stdout=delta, approved=approved)
@@ -120,12 +126,25 @@ class CommandBridge:
             approved_by_user=approved,
         )
 
-    def _calculate_delta(self, before: str, after: str) -> str:
+    def _calculate_delta(self, before: List[str], after: List[str]) -> str:
+        """Return the text appended to the pane between two snapshots.
+
+        Equivalent to slicing the joined ``after`` text past the joined
+        ``before`` text when the latter is a prefix, but compares and joins
+        lines so only the new output is copied.
+        """
+
         if not before:
-            return after
-        if after.startswith(before):
-            return after[len(before) :]
-        return after
+            return "\n".join(after)
+        last = len(before) - 1
+        if (
+            len(after) > last
+            and after[last].startswith(before[last])
+            and after[:last] == before[:last]
+        ):
+            head = after[last][len(before[last]) :]
+            return "\n".join([head, *after[last + 1 :]])
+        return "\n".join(after)
 
     def _log(
         self,
@@ -0,0 +1,34 @@
+"""JSON encoding helpers that prefer orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode *data* into Python objects."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Encode *obj* as compact UTF-8 JSON bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(
+        obj, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+__all__ = ["JSONDecodeError", "dumps", "loads"]
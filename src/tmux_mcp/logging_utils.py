@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
+import atexit
+import functools
 import json
+import logging
+import os
+import queue
 import threading
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict, List, Optional
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+LOGGER = logging.getLogger(__name__)
+
+_STOP = object()
 
 
 @dataclass(slots=True)
@@ -24,12 +38,29 @@ class LogRecord:
     stderr: str = ""
     safety_state: str = "allowed"
     approved_by_user: bool = False
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(
+        default_factory=functools.partial(datetime.now, timezone.utc)
+    )
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def to_bytes(self) -> bytes:
+        """Return the record as a UTF-8 encoded JSON object."""
+
+        if orjson is not None:
+            # orjson formats the timestamp natively; UTC is written with "Z".
+            return orjson.dumps(
+                self._payload(self.timestamp),
+                option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z,
+            )
+        payload = self._payload(_format_timestamp(self.timestamp))
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
     def to_json(self) -> str:
-        payload: Dict[str, Any] = {
-            "timestamp": self.timestamp.isoformat() + "Z",
+        return self.to_bytes().decode("utf-8")
+
+    def _payload(self, timestamp: Any) -> Dict[str, Any]:
+        return {
+            "timestamp": timestamp,
             "task_id": self.task_id,
             "session": self.session,
             "window": self.window,
@@ -42,11 +73,25 @@ class LogRecord:
             "approved_by_user": self.approved_by_user,
             "metadata": self.metadata,
         }
-        return json.dumps(payload, ensure_ascii=False)
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    """Format like orjson with ``OPT_NAIVE_UTC | OPT_UTC_Z``."""
+
+    offset = timestamp.utcoffset()
+    if offset is None or not offset:
+        return timestamp.replace(tzinfo=None).isoformat() + "Z"
+    return timestamp.isoformat()
 
 
 class StructuredLogWriter:
-    """Thread-safe helper that appends JSON records and rotates when needed."""
+    """Appends JSON records from a background thread and rotates when needed.
+
+    ``append`` only serialises the record and queues it, so callers never wait
+    on file I/O.  The writer thread drains whatever has accumulated and writes
+    it with a single ``write``/``flush`` pair.  Once :meth:`close` has run,
+    ``append`` writes synchronously instead.
+    """
 
     def __init__(
         self, log_path: Path, *, max_bytes: int = 5_000_000, backups: int = 3
@@ -56,22 +101,116 @@ class StructuredLogWriter:
         self.backups = backups
         self._lock = threading.Lock()
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh: Optional[BinaryIO] = self.log_path.open("ab")
+        self._size = os.fstat(self._fh.fileno()).st_size
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = threading.Thread(
+            target=self._drain, name="structured-log-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
 
     def append(self, record: LogRecord) -> None:
-        serialized = record.to_json()
+        data = record.to_bytes() + b"\n"
         with self._lock:
-            self._rotate_if_needed(len(serialized) + 1)
-            with self.log_path.open("a", encoding="utf-8") as fh:
-                fh.write(serialized)
-                fh.write("\n")
+            if self._thread is not None:
+                self._queue.put(data)
+                return
+            # Closed: nothing drains the queue any more, so write directly.
+            try:
+                self._write_batch([data])
+            finally:
+                if self._fh is not None:
+                    self._fh.close()
+                    self._fh = None
 
-    def _rotate_if_needed(self, incoming_bytes: int) -> None:
-        if not self.log_path.exists():
+    def close(self) -> None:
+        """Flush queued records, stop the writer thread and close the file."""
+
+        # _STOP is queued under the lock, so no record can land behind it.
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                self._write_batch(batch)
+            except Exception:
+                # Keep draining; a dead writer would let the queue grow forever.
+                LOGGER.exception("Failed to write %d log record(s)", len(batch))
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[bytes]) -> None:
+        # Records are grouped into runs that fit before the next rotation, so
+        # rotation still happens on the same record boundaries as one-by-one
+        # appends would produce.
+        self._reopen_if_replaced()
+        chunks: List[bytes] = []
+        chunk_bytes = 0
+        for data in batch:
+            if chunk_bytes and self._size + chunk_bytes + len(data) > self.max_bytes:
+                self._write(chunks, chunk_bytes)
+                chunks, chunk_bytes = [], 0
+            if not chunk_bytes:
+                self._rotate_if_needed(len(data))
+            chunks.append(data)
+            chunk_bytes += len(data)
+        self._write(chunks, chunk_bytes)
+
+    def _reopen_if_replaced(self) -> None:
+        # The handle stays open between batches; if the log was deleted or
+        # rotated by someone else, start writing to the file at log_path again.
+        if self._fh is None:
+            return
+        try:
+            current = os.stat(self.log_path)
+        except FileNotFoundError:
+            current = None
+        if current is not None and os.path.samestat(
+            current, os.fstat(self._fh.fileno())
+        ):
             return
-        projected_size = self.log_path.stat().st_size + incoming_bytes
-        if projected_size <= self.max_bytes:
+        self._fh.close()
+        self._fh = None
+        self._size = current.st_size if current is not None else 0
+
+    def _write(self, chunks: List[bytes], size: int) -> None:
+        if self._fh is None:
+            self._fh = self.log_path.open("ab")
+        self._fh.write(b"".join(chunks))
+        self._fh.flush()
+        self._size += size
+
+    def _rotate_if_needed(self, incoming_bytes: int) -> None:
+        # The size is tracked in-process, so no stat() call is needed per record.
+        if self._size == 0 or self._size + incoming_bytes <= self.max_bytes:
             return
 
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
         base = self.log_path
         oldest = base.with_name(f"{base.name}.{self.backups}")
         if oldest.exists():
@@ -81,7 +220,9 @@ class StructuredLogWriter:
             dst = base.with_name(f"{base.name}.{index + 1}")
             if src.exists():
                 src.rename(dst)
-        base.rename(base.with_name(f"{base.name}.1"))
+        if base.exists():
+            base.rename(base.with_name(f"{base.name}.1"))
+        self._size = 0
 
 
 __all__ = ["StructuredLogWriter", "LogRecord"]
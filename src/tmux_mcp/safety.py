@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
+import functools
 import re
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional
+from typing import Callable, Iterable, List, Optional, Sequence
+
+try:
+    import hyperscan  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None
+
+DESTRUCTIVE_REASON = "destructive-pattern"
+WARN_REASON = "warn-pattern"
+CLASSIFY_CACHE_SIZE = 1024
 
 
 @dataclass(slots=True)
@@ -26,6 +36,12 @@ class SafetyConfig:
         r"docker\s+system\s+prune",
     )
 
+    def __post_init__(self) -> None:
+        # Freeze the pattern lists so one-shot iterables (e.g. generators) can
+        # still be re-read when the matchers are rebuilt.
+        self.destructive_patterns = tuple(self.destructive_patterns)
+        self.warn_patterns = tuple(self.warn_patterns)
+
 
 @dataclass(slots=True)
 class SafetyEvaluation:
@@ -37,32 +53,37 @@ class SafetyEvaluation:
 class SafetyEvaluator:
     """Evaluates commands against destructive pattern lists."""
 
+    __slots__ = ("config", "_classify")
+
     def __init__(self, config: Optional[SafetyConfig] = None) -> None:
         self.config = config or SafetyConfig()
-        self._destructive = [
-            re.compile(pattern, re.IGNORECASE)
-            for pattern in self.config.destructive_patterns
-        ]
-        self._warn = [
-            re.compile(pattern, re.IGNORECASE) for pattern in self.config.warn_patterns
-        ]
-
-    def evaluate(self, command: str) -> SafetyEvaluation:
-        command = command.strip()
-        for pattern in self._destructive:
-            if pattern.search(command):
-                return SafetyEvaluation(
-                    requires_approval=True if self.config.safe_mode else False,
-                    blocked=False,
-                    reason="destructive-pattern",
-                )
-        for pattern in self._warn:
-            if pattern.search(command):
-                return SafetyEvaluation(
-                    requires_approval=self.config.safe_mode,
-                    blocked=False,
-                    reason="warn-pattern",
-                )
+        self._classify = _build_classifier(
+            self.config.destructive_patterns, self.config.warn_patterns
+        )
+
+    def evaluate(
+        self, command: str, *, safe_mode: Optional[bool] = None
+    ) -> SafetyEvaluation:
+        """Classify *command*, optionally overriding ``config.safe_mode``.
+
+        The override only applies to this call; shared config is left untouched.
+        """
+
+        if safe_mode is None:
+            safe_mode = self.config.safe_mode
+        reason = self._classify(command.strip())
+        if reason == DESTRUCTIVE_REASON:
+            return SafetyEvaluation(
+                requires_approval=True if safe_mode else False,
+                blocked=False,
+                reason=reason,
+            )
+        if reason == WARN_REASON:
+            return SafetyEvaluation(
+                requires_approval=safe_mode,
+                blocked=False,
+                reason=reason,
+            )
         return SafetyEvaluation(requires_approval=False, blocked=False, reason=None)
 
     def update_config(
@@ -75,15 +96,109 @@ class SafetyEvaluator:
         if safe_mode is not None:
             self.config.safe_mode = safe_mode
         if destructive_patterns is not None:
-            self.config.destructive_patterns = destructive_patterns
-            self._destructive = [
-                re.compile(pattern, re.IGNORECASE) for pattern in destructive_patterns
-            ]
+            self.config.destructive_patterns = tuple(destructive_patterns)
         if warn_patterns is not None:
-            self.config.warn_patterns = warn_patterns
-            self._warn = [
-                re.compile(pattern, re.IGNORECASE) for pattern in warn_patterns
-            ]
+            self.config.warn_patterns = tuple(warn_patterns)
+        if destructive_patterns is not None or warn_patterns is not None:
+            self._classify = _build_classifier(
+                self.config.destructive_patterns, self.config.warn_patterns
+            )
+
+
+class _RegexMatcher:
+    """Scans each pattern list with one combined ``re`` alternation if possible."""
+
+    __slots__ = ("_destructive", "_warn")
+
+    def __init__(self, destructive: Sequence[str], warn: Sequence[str]) -> None:
+        self._destructive = _compile_patterns(destructive)
+        self._warn = _compile_patterns(warn)
+
+    def classify(self, command: str) -> Optional[str]:
+        if any(regex.search(command) for regex in self._destructive):
+            return DESTRUCTIVE_REASON
+        if any(regex.search(command) for regex in self._warn):
+            return WARN_REASON
+        return None
+
+
+class _HyperscanMatcher:
+    """Scans all patterns in a single pass with a compiled Hyperscan database."""
+
+    __slots__ = ("_database", "_warn_start")
+
+    def __init__(self, destructive: Sequence[str], warn: Sequence[str]) -> None:
+        expressions = [pattern.encode("utf-8") for pattern in (*destructive, *warn)]
+        flag = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+        self._database = hyperscan.Database()
+        self._database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[flag] * len(expressions),
+        )
+        # Pattern ids below this index are destructive, the rest are warnings.
+        self._warn_start = len(destructive)
+
+    def classify(self, command: str) -> Optional[str]:
+        matched: List[int] = []
+
+        def on_match(pattern_id: int, *_: object) -> None:
+            matched.append(pattern_id)
+
+        self._database.scan(
+            command.encode("utf-8", "replace"), match_event_handler=on_match
+        )
+        if not matched:
+            return None
+        return DESTRUCTIVE_REASON if min(matched) < self._warn_start else WARN_REASON
+
+
+def _build_matcher(
+    destructive: Iterable[str], warn: Iterable[str]
+) -> _RegexMatcher | _HyperscanMatcher:
+    destructive = tuple(destructive)
+    warn = tuple(warn)
+    if hyperscan is not None and (destructive or warn):
+        try:
+            return _HyperscanMatcher(destructive, warn)
+        except Exception:  # pragma: no cover - syntax Hyperscan does not support
+            pass
+    return _RegexMatcher(destructive, warn)
+
+
+def _build_classifier(
+    destructive: Iterable[str], warn: Iterable[str]
+) -> Callable[[str], Optional[str]]:
+    """Return a memoised ``classify`` for the given pattern lists.
+
+    The cache lives on the returned callable, so replacing the patterns also
+    discards every cached result.
+    """
+
+    matcher = _build_matcher(destructive, warn)
+    return functools.lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(matcher.classify)
+
+
+def _compile_patterns(patterns: Iterable[str]) -> List[re.Pattern[str]]:
+    """Compile *patterns* case-insensitively, combined into one alternation.
+
+    Each pattern is compiled on its own first, so an invalid one still raises
+    ``re.error``. Patterns are kept separate when any has capturing groups,
+    since joining them renumbers groups and breaks backreferences such as
+    ``\\1``, and when they cannot share an alternation (global inline flags
+    such as ``(?i)``). An empty list yields no regexes, since an empty
+    alternation would match everything.
+    """
+
+    compiled = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    if len(compiled) < 2 or any(regex.groups for regex in compiled):
+        return compiled
+    try:
+        combined = "|".join(f"(?:{regex.pattern})" for regex in compiled)
+        return [re.compile(combined, re.IGNORECASE)]
+    except re.error:
+        return compiled
 
 
 __all__ = ["SafetyConfig", "SafetyEvaluation", "SafetyEvaluator"]
@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
-import json
+import contextlib
+import copy
+import functools
 import os
+import re
+import select
 import shlex
 import stat
-from dataclasses import dataclass, field
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple, TypeVar
 
 from cryptography.fernet import Fernet
 
@@ -21,6 +32,47 @@ import paramiko
 from paramiko.proxy import ProxyCommand
 from paramiko.ssh_exception import AuthenticationException, SSHException
 
+from . import json_utils
+
+
+DEFAULT_KEEPALIVE_INTERVAL = 30
+# Multiplexing defaults for the OpenSSH command line built by to_ssh_command.
+# Only the first invocation pays for the TCP/SSH handshake; later ones reuse
+# the master connection for up to ControlPersist seconds.
+CONTROL_DIR = "~/.ssh"
+SSH_MULTIPLEX_OPTIONS = {
+    "ControlMaster": "auto",
+    "ControlPersist": "60",
+    # %C is a hash of the connection parameters; spelling out %r@%h:%p can
+    # exceed the ~104-byte Unix socket path limit for long names.
+    "ControlPath": f"{CONTROL_DIR}/tmux_mcp-%C",
+}
+
+
+PANE_CACHE_TTL = 1.0
+# sshd's default MaxStartups allows 10 concurrent unauthenticated connections;
+# stay within it when fanning out, as several profiles may share a host.
+DEFAULT_MAP_WORKERS = 10
+
+T = TypeVar("T")
+# ProxyCommand tokens expanded by _connect, in a single pass.
+_PROXY_TOKEN_RE = re.compile(r"%[hpr]")
+# tmux commands that can add, remove or renumber panes.
+_LAYOUT_COMMANDS = frozenset(
+    {
+        "split-window",
+        "kill-pane",
+        "select-layout",
+        "new-window",
+        "kill-window",
+        "kill-session",
+        "join-pane",
+        "break-pane",
+        "move-pane",
+        "swap-pane",
+    }
+)
+
 
 class SessionError(RuntimeError):
     """Raised when tmux session interactions fail."""
@@ -36,13 +88,137 @@ class ConnectionProfile:
     ssh_options: Dict[str, str] = field(default_factory=dict)
 
     def to_ssh_command(self) -> str:
-        parts = ["ssh", "-p", str(self.port)]
-        if self.identity_file:
-            parts.extend(["-i", self.identity_file])
-        for key, value in self.ssh_options.items():
-            parts.extend(["-o", f"{key}={value}"])
-        parts.append(f"{self.username}@{self.hostname}")
-        return " ".join(shlex.quote(part) for part in parts)
+        command, multiplexed = _call_cached(
+            _build_ssh_command,
+            self.hostname,
+            self.username,
+            self.port,
+            self.identity_file,
+            tuple(self.ssh_options.items()),
+        )
+        if multiplexed:
+            _ensure_control_dir(os.path.expanduser(CONTROL_DIR))
+        return command
+
+    @property
+    def normalized_options(self) -> Mapping[str, str]:
+        """``ssh_options`` with lower-cased keys, shared between equal profiles."""
+
+        return _call_cached(_normalize_options, tuple(self.ssh_options.items()))
+
+
+_PROFILE_FIELDS = tuple(item.name for item in fields(ConnectionProfile))
+
+
+def _call_cached(func: Callable[..., T], *args: object) -> T:
+    """Call the ``lru_cache``-wrapped *func*, bypassing the cache if needed.
+
+    Profiles may carry unhashable ssh option values, such as lists.
+    """
+
+    try:
+        hash(args)
+    except TypeError:
+        return func.__wrapped__(*args)
+    return func(*args)
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote(part: str) -> str:
+    return shlex.quote(part)
+
+
+@functools.lru_cache(maxsize=64)
+def _normalize_options(
+    ssh_options: Tuple[Tuple[str, str], ...],
+) -> Mapping[str, str]:
+    return MappingProxyType({key.lower(): value for key, value in ssh_options})
+
+
+@functools.lru_cache(maxsize=64)
+def _build_ssh_command(
+    hostname: str,
+    username: str,
+    port: int,
+    identity_file: Optional[str],
+    ssh_options: Tuple[Tuple[str, str], ...],
+) -> Tuple[str, bool]:
+    parts = ["ssh", "-p", str(port)]
+    if identity_file:
+        parts.extend(["-i", identity_file])
+    for key, value in ssh_options:
+        parts.extend(["-o", f"{key}={value}"])
+    overridden = _call_cached(_normalize_options, ssh_options)
+    multiplexed = str(overridden.get("controlmaster", "")).lower() != "no"
+    if multiplexed:
+        for key, value in SSH_MULTIPLEX_OPTIONS.items():
+            if key.lower() not in overridden:
+                parts.extend(["-o", f"{key}={value}"])
+    parts.append(f"{username}@{hostname}")
+    return " ".join(_quote(part) for part in parts), multiplexed
+
+
+def _profile_from_row(name: str, row: Mapping[str, object]) -> ConnectionProfile:
+    # Rows are shared with the store's cache; give each profile its own options.
+    options = row.get("ssh_options")
+    if isinstance(options, dict):
+        row = {**row, "ssh_options": dict(options)}
+    return ConnectionProfile(name=name, **row)
+
+
+class _LazyProfilesView(Mapping[str, ConnectionProfile]):
+    """Read-only view that builds each ``ConnectionProfile`` on access."""
+
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows: Mapping[str, Dict[str, object]]) -> None:
+        self._rows = rows
+
+    def __getitem__(self, name: str) -> ConnectionProfile:
+        return _profile_from_row(name, self._rows[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def _file_stamp(path: str) -> Optional[Tuple[str, float]]:
+    try:
+        return path, os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=16)
+def _load_host_keys(files: Tuple[Tuple[str, float], ...]) -> paramiko.HostKeys:
+    host_keys = paramiko.HostKeys()
+    for path, _mtime in files:
+        try:
+            host_keys.load(path)
+        except Exception:  # pragma: no cover - defensive
+            pass
+    return host_keys
+
+
+@functools.lru_cache(maxsize=16)
+def _load_private_key(path: str, mtime: float) -> Optional[paramiko.PKey]:
+    try:
+        key = paramiko.PKey.from_path(path)
+        certificate = path + "-cert.pub"
+        if os.path.exists(certificate):
+            key.load_certificate(certificate)
+    except Exception:
+        # Encrypted or unsupported keys are left to paramiko's own loader.
+        return None
+    return key
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_control_dir(path: str) -> None:
+    # Cached so the directory is created once per path, not on every command.
+    os.makedirs(path, mode=0o700, exist_ok=True)
 
 
 class KeyProvider:
@@ -97,16 +273,42 @@ class ConnectionProfileStore:
             self.config_dir = fallback
         self.path = self.config_dir / "connections.json.enc"
         self.key_provider = key_provider or KeyProvider()
-
-    def list_profiles(self) -> Dict[str, ConnectionProfile]:
-        data = self._load()
-        return {
-            name: ConnectionProfile(name=name, **payload)
-            for name, payload in data.items()
-        }
+        self._profile_dicts: Optional[Dict[str, Dict[str, object]]] = None
+        # Decrypted contents keyed by the file's (mtime_ns, size), so the file is
+        # only read and decrypted again when it changes on disk.
+        self._cache: Optional[Dict[str, Dict[str, object]]] = None
+        self._cache_stat: Optional[Tuple[int, int]] = None
+        self._cipher: Optional[Fernet] = None
+        # Inside batch() writes only update the cache; the file is written once
+        # when the outermost batch exits.
+        self._batch_depth = 0
+        self._dirty = False
+
+    def list_profiles(self) -> Mapping[str, ConnectionProfile]:
+        """Return a read-only mapping that builds profiles as they are accessed."""
+
+        return _LazyProfilesView(copy.copy(self._raw()))
+
+    def list_profile_dicts(self) -> Dict[str, Dict[str, object]]:
+        """Return profiles as plain dicts, cached until the store changes.
+
+        The returned mapping is shared; callers must not mutate it.
+        """
+
+        # _raw() drops the cached dicts when the file changed on disk.
+        rows = self._raw()
+        if self._profile_dicts is None:
+            self._profile_dicts = {
+                name: {key: getattr(profile, key) for key in _PROFILE_FIELDS}
+                for name, profile in _LazyProfilesView(rows).items()
+            }
+        return self._profile_dicts
 
     def get_profile(self, name: str) -> Optional[ConnectionProfile]:
-        return self.list_profiles().get(name)
+        payload = self._raw().get(name)
+        if payload is None:
+            return None
+        return _profile_from_row(name, payload)
 
     def save_profile(self, profile: ConnectionProfile) -> None:
         data = self._load()
@@ -115,47 +317,128 @@ class ConnectionProfileStore:
             "username": profile.username,
             "port": profile.port,
             "identity_file": profile.identity_file,
-            "ssh_options": profile.ssh_options,
+            "ssh_options": dict(profile.ssh_options),
         }
-        self._store(data)
+        self._commit(data)
 
     def delete_profile(self, name: str) -> None:
         data = self._load()
         data.pop(name, None)
-        self._store(data)
+        self._commit(data)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Coalesce saves and deletes into a single encrypted write.
+
+        Pending changes are discarded if the block raises.
+        """
+
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._batch_depth == 1 and self._dirty:
+                self._discard_pending()
+            raise
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0 and self._dirty:
+            try:
+                self._store(self._cache)
+            except BaseException:
+                # Nothing reached disk; reload the file on the next read.
+                self._discard_pending()
+                raise
+            self._dirty = False
+
+    def _discard_pending(self) -> None:
+        self._dirty = False
+        self._cache = None
+        self._cache_stat = None
+        self._profile_dicts = None
+
+    def _commit(self, data: Dict[str, Dict[str, object]]) -> None:
+        self._profile_dicts = None
+        if self._batch_depth:
+            self._cache = data
+            self._dirty = True
+        else:
+            self._store(data)
 
     def _load(self) -> Dict[str, Dict[str, object]]:
-        if not self.path.exists():
+        return copy.copy(self._raw())
+
+    def _raw(self) -> Dict[str, Dict[str, object]]:
+        """Return the decrypted profile rows; shared, so never mutate them."""
+
+        if self._dirty:
+            return self._cache
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._cache = None
+            self._cache_stat = None
+            self._profile_dicts = None
             return {}
-        cipher = self._get_cipher()
-        payload = self.path.read_bytes()
-        decrypted = cipher.decrypt(payload)
-        return json.loads(decrypted.decode("utf-8"))
+        signature = (st.st_mtime_ns, st.st_size)
+        if self._cache is None or signature != self._cache_stat:
+            cipher = self._get_cipher()
+            payload = self.path.read_bytes()
+            decrypted = cipher.decrypt(payload)
+            self._cache = json_utils.loads(decrypted)
+            self._cache_stat = signature
+            self._profile_dicts = None
+        return self._cache
 
     def _store(self, data: Dict[str, Dict[str, object]]) -> None:
         cipher = self._get_cipher()
-        serialized = json.dumps(data).encode("utf-8")
+        serialized = json_utils.dumps(data)
         encrypted = cipher.encrypt(serialized)
-        self.path.write_bytes(encrypted)
+        # Write to a sibling temp file and rename over the store, so a crash
+        # mid-write never leaves a truncated blob behind.
+        fd, tmp_path = tempfile.mkstemp(dir=self.config_dir, prefix=".connections-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(encrypted)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+        st = os.stat(self.path)
+        self._cache = data
+        self._cache_stat = (st.st_mtime_ns, st.st_size)
 
     def _get_cipher(self) -> Fernet:
-        key = self.key_provider.get_key()
-        if key is None:
-            key = Fernet.generate_key()
-            self.key_provider.set_key(key)
-        return Fernet(key)
+        if self._cipher is None:
+            key = self.key_provider.get_key()
+            if key is None:
+                key = Fernet.generate_key()
+                self.key_provider.set_key(key)
+            self._cipher = Fernet(key)
+        return self._cipher
 
 
 def _format_tmux_command(*parts: str) -> str:
-    return " ".join(shlex.quote(part) for part in parts)
+    return " ".join(map(_quote, parts))
 
 
 @dataclass(slots=True)
 class _CommandResult:
-    stdout: str
-    stderr: str
+    # Raw bytes; most callers only look at returncode, so decoding is left to
+    # the few that read the output.
+    stdout: bytes
+    stderr: bytes
     returncode: int
 
+    @property
+    def stdout_text(self) -> str:
+        return self.stdout.decode("utf-8", errors="replace")
+
+    @property
+    def stderr_text(self) -> str:
+        return self.stderr.decode("utf-8", errors="replace")
+
 
 class _RemoteTmuxClient:
     """Executes tmux commands on a remote host via a persistent SSH session."""
@@ -163,17 +446,36 @@ class _RemoteTmuxClient:
     def __init__(self, profile: ConnectionProfile, *, timeout: int = 30) -> None:
         self.profile = profile
         self._timeout = timeout
-        self._options = {
-            key.lower(): value for key, value in profile.ssh_options.items()
-        }
+        self._options = profile.normalized_options
         self._proxy: Optional[ProxyCommand] = None
         self._ssh: Optional[paramiko.SSHClient] = None
+        # Long-lived remote ``sh`` that commands are streamed into; opened on
+        # first use. ``_shell_failed`` pins the exec_command fallback when the
+        # server refuses to start one.
+        self._shell: Optional[paramiko.Channel] = None
+        self._shell_failed = False
+        # Serialises commands on the shared shell channel across threads.
+        self._lock = threading.Lock()
+        # (session, window) -> (fetched_at, {pane_id or pane_index: pane})
+        self._pane_cache: Dict[
+            Tuple[str, str], Tuple[float, Dict[str, "_RemotePane"]]
+        ] = {}
+        # (pane_id, lines) -> capture result, kept only inside batch().
+        self._batch_depth = 0
+        self._batch_captures: Dict[Tuple[str, int], _CommandResult] = {}
         self._ssh = self._connect()
 
     def __del__(self) -> None:  # pragma: no cover - best effort cleanup
         self.close()
 
+    def is_active(self) -> bool:
+        if self._ssh is None:
+            return False
+        transport = self._ssh.get_transport()
+        return transport is not None and transport.is_active()
+
     def close(self) -> None:
+        self._close_shell()
         if self._ssh is not None:
             try:
                 self._ssh.close()
@@ -188,44 +490,149 @@ class _RemoteTmuxClient:
     def ensure_session(
         self, *, session_name: str, window_name: Optional[str] = None
     ) -> None:
-        exists = self._run_tmux("has-session", "-t", session_name)
-        if exists.returncode != 0:
-            args = ["new-session", "-d", "-s", session_name]
-            if window_name:
-                args.extend(["-n", window_name])
-            created = self._run_tmux(*args)
-            if created.returncode != 0:
-                self._handle_failure(created, f"create session '{session_name}'")
+        # Check/create the session and the window in one round trip; exit
+        # status 2 marks a failed new-session and 3 a failed new-window.
+        new_session = ["tmux", "new-session", "-d", "-s", session_name]
         if window_name:
-            if not self._window_exists(session_name, window_name):
-                created = self._run_tmux(
-                    "new-window", "-t", session_name, "-n", window_name
-                )
-                if created.returncode != 0:
-                    self._handle_failure(
-                        created,
-                        f"create window '{window_name}' in session '{session_name}'",
-                    )
+            new_session.extend(["-n", window_name])
+        has_session = _format_tmux_command("tmux", "has-session", "-t", session_name)
+        script = (
+            f"{has_session} 2>/dev/null || {_format_tmux_command(*new_session)}"
+            " || exit 2"
+        )
+        if window_name:
+            has_window = _window_check_command(session_name, window_name)
+            new_window = _format_tmux_command(
+                "tmux", "new-window", "-t", session_name, "-n", window_name
+            )
+            script += f"; {has_window} 2>/dev/null || {new_window} || exit 3"
+        # The session may be created here, so any cached pane layout is stale.
+        self._pane_cache.clear()
+        result = self._run_raw(script)
+        if result.returncode == 2:
+            self._handle_failure(result, f"create session '{session_name}'")
+        if result.returncode == 3:
+            self._handle_failure(
+                result,
+                f"create window '{window_name}' in session '{session_name}'",
+            )
 
     def get_pane(
         self, session_name: str, window_name: str, pane_ref: str
     ) -> "_RemotePane":
+        key = (session_name, window_name)
+        cached = self._pane_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < PANE_CACHE_TTL:
+            pane = cached[1].get(pane_ref)
+            if pane is not None:
+                return pane
+        # Miss or stale entry: the pane may have been created since the last
+        # listing, so a cached miss is never reported without re-listing.
+        panes = self._list_panes(session_name, window_name)
+        self._pane_cache[key] = (time.monotonic(), panes)
+        pane = panes.get(pane_ref)
+        if pane is None:
+            raise SessionError(f"Pane '{pane_ref}' not available")
+        return pane
+
+    def _list_panes(
+        self, session_name: str, window_name: str
+    ) -> Dict[str, "_RemotePane"]:
         target = f"{session_name}:{window_name}"
         panes = self._run_tmux(
             "list-panes", "-t", target, "-F", "#{pane_id}:#{pane_index}"
         )
         if panes.returncode != 0:
             self._handle_failure(panes, f"locate panes in window '{window_name}'")
-        for line in panes.stdout.splitlines():
+        mapping: Dict[str, _RemotePane] = {}
+        for line in panes.stdout_text.splitlines():
             if not line:
                 continue
             try:
                 pane_id, pane_index = line.split(":", 1)
             except ValueError:
                 continue
-            if pane_ref in {pane_id, pane_index}:
-                return _RemotePane(self, pane_id)
-        raise SessionError(f"Pane '{pane_ref}' not available")
+            pane = _RemotePane(self, pane_id)
+            # Earlier panes win, matching the order of the former linear scan.
+            mapping.setdefault(pane_id, pane)
+            mapping.setdefault(pane_index, pane)
+        return mapping
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Serve ``capture_pane`` calls from shared snapshots while active.
+
+        The first capture of a pane captures every known pane of its window in
+        one round trip; other captures reuse that snapshot until the next tmux
+        command runs.
+        """
+
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._batch_captures.clear()
+
+    def capture_panes(
+        self, pane_ids: Iterable[str], lines: int = 200
+    ) -> Dict[str, list[str]]:
+        """Capture several panes with a single remote command."""
+
+        results = self._capture_results(pane_ids, lines)
+        for pane_id, result in results.items():
+            if result.returncode != 0:
+                self._handle_failure(result, f"capture pane '{pane_id}'")
+        return {
+            pane_id: _split_capture(result.stdout)
+            for pane_id, result in results.items()
+        }
+
+    def _batched_capture(self, pane_id: str, lines: int) -> _CommandResult:
+        result = self._batch_captures.get((pane_id, lines))
+        if result is None:
+            pane_ids = [pane_id]
+            for _, panes in self._pane_cache.values():
+                if pane_id in panes:
+                    pane_ids.extend(pane._pane_id for pane in panes.values())
+                    break
+            captured = self._capture_results(dict.fromkeys(pane_ids), lines)
+            for captured_id, captured_result in captured.items():
+                self._batch_captures[(captured_id, lines)] = captured_result
+            result = captured[pane_id]
+        return result
+
+    def _capture_results(
+        self, pane_ids: Iterable[str], lines: int
+    ) -> Dict[str, _CommandResult]:
+        pane_ids = list(pane_ids)
+        if not pane_ids:
+            return {}
+        # Each capture is followed by a marker carrying its exit status on
+        # stdout and a bare marker on stderr, so both streams split per pane.
+        marker = f"__PANE_{uuid.uuid4().hex}__"
+        out_marker = f"\n{marker}:".encode("ascii")
+        err_marker = f"\n{marker}\n".encode("ascii")
+        script = "\n".join(
+            f"{_format_tmux_command('tmux', *_capture_args(pane_id, lines))}; "
+            f"printf '\\n{marker}:%s\\n' \"$?\"; printf '\\n{marker}\\n' >&2"
+            for pane_id in pane_ids
+        )
+        result = self._run_raw(script)
+        out = result.stdout.split(out_marker)
+        err = result.stderr.split(err_marker)
+        if len(out) <= len(pane_ids) or len(err) < len(pane_ids):
+            self._handle_failure(result, "capture panes")
+        results: Dict[str, _CommandResult] = {}
+        stdout = out[0]
+        for index, pane_id in enumerate(pane_ids):
+            status, _, following = out[index + 1].partition(b"\n")
+            results[pane_id] = _CommandResult(
+                stdout=stdout, stderr=err[index], returncode=int(status)
+            )
+            stdout = following
+        return results
 
     def list_windows(self, session_name: str) -> list[str]:
         result = self._run_tmux(
@@ -233,14 +640,31 @@ class _RemoteTmuxClient:
         )
         if result.returncode != 0:
             self._handle_failure(result, f"inspect windows for '{session_name}'")
-        return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+        return _split_lines(result.stdout)
 
     def _window_exists(self, session_name: str, window_name: str) -> bool:
-        return window_name in self.list_windows(session_name)
+        if not _exact_target_safe(window_name):
+            return window_name in self.list_windows(session_name)
+        result = self._run_tmux(
+            "has-session", "-t", _window_target(session_name, window_name)
+        )
+        return result.returncode == 0
 
     def _connect(self) -> paramiko.SSHClient:
         client = paramiko.SSHClient()
-        client.load_system_host_keys()
+        system_stamp = _file_stamp(os.path.expanduser("~/.ssh/known_hosts"))
+        user_stamps: Tuple[Tuple[str, float], ...] = ()
+        known_hosts = self._options.get("userknownhostsfile")
+        if known_hosts:
+            paths = (os.path.expanduser(path) for path in shlex.split(known_hosts))
+            user_stamps = tuple(filter(None, map(_file_stamp, paths)))
+        # Host keys are only ever read here, so every client shares one parsed
+        # set; keys accepted by AutoAddPolicy still land in client._host_keys.
+        stamps = ((system_stamp,) if system_stamp else ()) + user_stamps
+        client._system_host_keys = _load_host_keys(stamps)
+        if user_stamps:
+            # As load_host_keys() would, save auto-added keys to the last file.
+            client._host_keys_filename = user_stamps[-1][0]
         strict = self._options.get("stricthostkeychecking", "no").lower()
         if strict == "yes":
             client.set_missing_host_key_policy(paramiko.RejectPolicy())
@@ -263,29 +687,27 @@ class _RemoteTmuxClient:
 
         if self.profile.identity_file:
             key_path = os.path.expanduser(self.profile.identity_file)
-            if os.path.exists(key_path):
-                connect_kwargs["key_filename"] = key_path
+            stamp = _file_stamp(key_path)
+            if stamp is not None:
+                pkey = _load_private_key(*stamp)
+                if pkey is not None:
+                    connect_kwargs["pkey"] = pkey
+                else:
+                    connect_kwargs["key_filename"] = key_path
 
         password = self._options.get("password")
         if password:
             connect_kwargs["password"] = password
 
-        known_hosts = self._options.get("userknownhostsfile")
-        if known_hosts:
-            for path in shlex.split(known_hosts):
-                expanded = os.path.expanduser(path)
-                if os.path.exists(expanded):
-                    try:
-                        client.load_host_keys(expanded)
-                    except Exception:  # pragma: no cover - defensive
-                        pass
-
         proxy_command = self._options.get("proxycommand")
         if proxy_command:
-            formatted = (
-                proxy_command.replace("%h", self.profile.hostname)
-                .replace("%p", str(self.profile.port))
-                .replace("%r", self.profile.username)
+            tokens = {
+                "%h": self.profile.hostname,
+                "%p": str(self.profile.port),
+                "%r": self.profile.username,
+            }
+            formatted = _PROXY_TOKEN_RE.sub(
+                lambda match: tokens[match.group(0)], proxy_command
             )
             self._proxy = ProxyCommand(formatted)
             connect_kwargs["sock"] = self._proxy
@@ -305,44 +727,164 @@ class _RemoteTmuxClient:
                 f"Unable to reach {self.profile.hostname}:{self.profile.port}"
             ) from exc
 
+        # Pooled connections can sit idle for a long time, so always send
+        # keepalives to stop NAT/firewall state from expiring underneath them.
+        interval = DEFAULT_KEEPALIVE_INTERVAL
         keepalive = self._options.get("serveraliveinterval")
         if keepalive:
             try:
                 interval = int(keepalive)
             except ValueError:  # pragma: no cover - defensive
-                interval = 0
-            if interval > 0:
-                transport = client.get_transport()
-                if transport is not None:
-                    transport.set_keepalive(interval)
+                pass
+        if interval > 0:
+            transport = client.get_transport()
+            if transport is not None:
+                transport.set_keepalive(interval)
 
         return client
 
     def _run_tmux(self, *args: str) -> _CommandResult:
+        if args and args[0] in _LAYOUT_COMMANDS:
+            self._pane_cache.clear()
+        self._batch_captures.clear()
+        return self._run_raw(_format_tmux_command("tmux", *args))
+
+    def _run_raw(self, command: str) -> _CommandResult:
+        """Run a pre-quoted shell *command* line on the remote host.
+
+        Commands go through the persistent shell channel when one is available,
+        saving a channel open per call, and through ``exec_command`` otherwise.
+        """
+
+        with self._lock:
+            return self._run_locked(command)
+
+    def _run_locked(self, command: str) -> _CommandResult:
         if self._ssh is None:
             raise SessionError("SSH session not established")
-        command = _format_tmux_command("tmux", *args)
-        try:
-            stdin, stdout, stderr = self._ssh.exec_command(
-                command,
-                timeout=self._timeout,
+        shell = self._get_shell()
+        if shell is not None:
+            tag = uuid.uuid4().hex
+            script = (
+                f"( {command}\n) </dev/null; "
+                f"printf '\\n__END_{tag}__:%s\\n' \"$?\"; "
+                f"printf '\\n__END_{tag}__\\n' >&2\n"
             )
             try:
-                exit_code = stdout.channel.recv_exit_status()
+                shell.sendall(script.encode("utf-8"))
+            except (SSHException, OSError) as exc:
+                # Part of the command may already have run, so it is not retried.
+                self._close_shell()
+                raise SessionError(
+                    "SSH connection lost while issuing tmux command"
+                ) from exc
+            return self._read_shell_result(shell, tag)
+        return self._run_exec(command)
+
+    def _run_exec(self, command: str) -> _CommandResult:
+        transport = self._ssh.get_transport() if self._ssh is not None else None
+        if transport is None:
+            raise SessionError("SSH session not established")
+        out = bytearray()
+        err = bytearray()
+        try:
+            channel = transport.open_session(timeout=self._timeout)
+            try:
+                channel.settimeout(self._timeout)
+                channel.exec_command(command)
+                channel.shutdown_write()
+                # Drain both streams as data arrives; the exit status follows the
+                # data on the wire, so once it is in, the buffers hold the rest.
+                idle_since = time.monotonic()
+                while True:
+                    if channel.recv_ready():
+                        out += channel.recv(65536)
+                    elif channel.recv_stderr_ready():
+                        err += channel.recv_stderr(65536)
+                    elif channel.exit_status_ready():
+                        break
+                    elif time.monotonic() - idle_since > self._timeout:
+                        raise TimeoutError("timed out waiting for tmux command")
+                    else:
+                        select.select([channel], [], [], 0.1)
+                        continue
+                    idle_since = time.monotonic()
+                exit_code = channel.recv_exit_status()
             finally:
-                stdin.close()
-            stdout_data = stdout.read().decode("utf-8", errors="replace")
-            stderr_data = stderr.read().decode("utf-8", errors="replace")
-            return _CommandResult(
-                stdout=stdout_data, stderr=stderr_data, returncode=exit_code
-            )
-        except SSHException as exc:
+                channel.close()
+        except (SSHException, OSError) as exc:
+            raise SessionError(
+                "SSH connection lost while issuing tmux command"
+            ) from exc
+        return _CommandResult(
+            stdout=bytes(out),
+            stderr=bytes(err),
+            returncode=exit_code,
+        )
+
+    def _get_shell(self) -> Optional[paramiko.Channel]:
+        if self._shell is not None and not self._shell.closed:
+            return self._shell
+        self._shell = None
+        if self._shell_failed or self._ssh is None:
+            return None
+        transport = self._ssh.get_transport()
+        if transport is None:
+            return None
+        try:
+            channel = transport.open_session(timeout=self._timeout)
+            # No pty: no echo, no prompt, and stderr stays on its own stream.
+            channel.exec_command("sh")
+        except (SSHException, OSError):
+            self._shell_failed = True
+            return None
+        self._shell = channel
+        return channel
+
+    def _close_shell(self) -> None:
+        if self._shell is not None:
+            try:
+                self._shell.close()
+            finally:
+                self._shell = None
+
+    def _read_shell_result(self, shell: paramiko.Channel, tag: str) -> _CommandResult:
+        out_marker = f"\n__END_{tag}__:".encode("ascii")
+        err_marker = f"\n__END_{tag}__\n".encode("ascii")
+        out = bytearray()
+        err = bytearray()
+        out_end = status_end = err_end = -1
+        try:
+            while status_end < 0 or err_end < 0:
+                if shell.recv_ready():
+                    out += shell.recv(65536)
+                    if out_end < 0:
+                        out_end = out.find(out_marker)
+                    if out_end >= 0:
+                        status_end = out.find(b"\n", out_end + len(out_marker))
+                elif shell.recv_stderr_ready():
+                    err += shell.recv_stderr(65536)
+                    if err_end < 0:
+                        err_end = err.find(err_marker)
+                elif shell.eof_received or shell.closed:
+                    raise EOFError("remote shell exited")
+                elif not select.select([shell], [], [], self._timeout)[0]:
+                    raise TimeoutError("timed out waiting for tmux command")
+        except (SSHException, OSError, EOFError) as exc:
+            # The shell's position in its input stream is unknown now; drop it
+            # so the next command starts a fresh one.
+            self._close_shell()
             raise SessionError(
                 "SSH connection lost while issuing tmux command"
             ) from exc
+        return _CommandResult(
+            stdout=bytes(out[:out_end]),
+            stderr=bytes(err[:err_end]),
+            returncode=int(out[out_end + len(out_marker) : status_end]),
+        )
 
     def _handle_failure(self, result: _CommandResult, action: str) -> None:
-        payload = (result.stderr or result.stdout or "unknown error").strip()
+        payload = (result.stderr_text or result.stdout_text or "unknown error").strip()
         lowered = payload.lower()
         if "tmux" in lowered and "not found" in lowered:
             raise SessionError(
@@ -363,16 +905,13 @@ class _RemotePane:
         self._pane_id = pane_id
 
     def capture_pane(self, lines: int = 200) -> list[str]:
-        result = self._client._run_tmux(
-            "capture-pane", "-t", self._pane_id, "-p", "-S", f"-{lines}"
-        )
+        if self._client._batch_depth:
+            result = self._client._batched_capture(self._pane_id, lines)
+        else:
+            result = self._client._run_tmux(*_capture_args(self._pane_id, lines))
         if result.returncode != 0:
             self._client._handle_failure(result, f"capture pane '{self._pane_id}'")
-        text = result.stdout or ""
-        stripped = text.rstrip("\n")
-        if not stripped:
-            return []
-        return stripped.splitlines()
+        return _split_capture(result.stdout)
 
     def send_keys(self, keys: str, enter: bool = True) -> None:
         args = ["send-keys", "-t", self._pane_id, keys]
@@ -383,6 +922,50 @@ class _RemotePane:
             self._client._handle_failure(result, f"send keys to pane '{self._pane_id}'")
 
 
+def _capture_args(pane_id: str, lines: int) -> list[str]:
+    return ["capture-pane", "-t", pane_id, "-p", "-S", f"-{lines}"]
+
+
+def _window_target(session_name: str, window_name: str) -> str:
+    # "=" asks tmux for an exact window name rather than a prefix match.
+    return f"{session_name}:={window_name}"
+
+
+def _exact_target_safe(window_name: str) -> bool:
+    # tmux reads "." and ":" in a target as pane and window separators.
+    return "." not in window_name and ":" not in window_name
+
+
+def _window_check_command(session_name: str, window_name: str) -> str:
+    """Return a shell command that succeeds if the window exists."""
+
+    if _exact_target_safe(window_name):
+        return _format_tmux_command(
+            "tmux", "has-session", "-t", _window_target(session_name, window_name)
+        )
+    list_windows = _format_tmux_command(
+        "tmux", "list-windows", "-t", session_name, "-F", "#{window_name}"
+    )
+    return f"{list_windows} | grep -Fqx -e {_quote(window_name)}"
+
+
+def _split_lines(data: bytes) -> list[str]:
+    return [
+        line.strip().decode("utf-8", errors="replace")
+        for line in data.splitlines()
+        if line.strip()
+    ]
+
+
+def _split_capture(data: bytes) -> list[str]:
+    stripped = data.rstrip(b"\n")
+    if not stripped:
+        return []
+    # One decode of the whole capture is cheaper than one per line, and keeps
+    # str.splitlines() semantics for the pane text.
+    return stripped.decode("utf-8", errors="replace").splitlines()
+
+
 class SessionManager:
     """Controls remote tmux sessions and panes via SSH."""
 
@@ -393,6 +976,9 @@ class SessionManager:
         self._timeout = timeout
         self._tmux_client: Optional[_RemoteTmuxClient] = None
         self._current_profile: Optional[ConnectionProfile] = None
+        # Profile name -> client; replaced once the profile's settings change.
+        self._pool: Dict[str, _RemoteTmuxClient] = {}
+        self._pool_lock = threading.Lock()
 
     def connect(
         self, profile_name: str, *, session_name: str, window_name: Optional[str] = None
@@ -400,9 +986,7 @@ class SessionManager:
         profile = self.profile_store.get_profile(profile_name)
         if profile is None:
             raise SessionError(f"Profile '{profile_name}' not found")
-        if self._tmux_client is not None:
-            self._tmux_client.close()
-        self._tmux_client = _RemoteTmuxClient(profile, timeout=self._timeout)
+        self._tmux_client = self._pooled_client(profile)
         self._current_profile = profile
         self.ensure_session(session_name=session_name, window_name=window_name)
 
@@ -423,11 +1007,75 @@ class SessionManager:
         return self._tmux_client.get_pane(session_name, window_name, pane_ref)
 
     def disconnect(self) -> None:
-        if self._tmux_client is not None:
-            self._tmux_client.close()
+        # The client stays in the pool so a later connect can reuse it.
         self._tmux_client = None
         self._current_profile = None
 
+    def shutdown(self) -> None:
+        """Disconnect and close every pooled SSH connection."""
+
+        self.disconnect()
+        with self._pool_lock:
+            pool, self._pool = self._pool, {}
+        for client in pool.values():
+            client.close()
+
+    def map(
+        self,
+        profile_names: Iterable[str],
+        fn: Callable[[_RemoteTmuxClient], T],
+        *,
+        max_workers: int = DEFAULT_MAP_WORKERS,
+    ) -> Dict[str, T]:
+        """Run *fn* against each profile's pooled client in parallel.
+
+        Connections are established concurrently as well. Results are keyed by
+        profile name; the first failure is re-raised once all calls finish.
+        """
+
+        names = list(dict.fromkeys(profile_names))
+        if not names:
+            return {}
+        profiles: Dict[str, ConnectionProfile] = {}
+        for name in names:
+            profile = self.profile_store.get_profile(name)
+            if profile is None:
+                raise SessionError(f"Profile '{name}' not found")
+            profiles[name] = profile
+
+        def run(profile: ConnectionProfile) -> T:
+            return fn(self._pooled_client(profile))
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+            futures = {name: pool.submit(run, profiles[name]) for name in names}
+        return {name: future.result() for name, future in futures.items()}
+
+    def _pooled_client(self, profile: ConnectionProfile) -> _RemoteTmuxClient:
+        with self._pool_lock:
+            client = self._pool.get(profile.name)
+            if client is not None and not self._reusable(client, profile):
+                del self._pool[profile.name]
+                client.close()
+                client = None
+        if client is not None:
+            return client
+        # Connect outside the lock so handshakes to different hosts overlap.
+        client = _RemoteTmuxClient(profile, timeout=self._timeout)
+        with self._pool_lock:
+            existing = self._pool.get(profile.name)
+            if existing is not None:
+                if self._reusable(existing, profile):
+                    client.close()
+                    return existing
+                existing.close()
+            self._pool[profile.name] = client
+        return client
+
+    @staticmethod
+    def _reusable(client: _RemoteTmuxClient, profile: ConnectionProfile) -> bool:
+        # Any change to the host, key or ssh options needs a fresh connection.
+        return client.profile == profile and client.is_active()
+
     @property
     def current_profile(self) -> Optional[ConnectionProfile]:
         return self._current_profile
@@ -4,10 +4,28 @@ from __future__ import annotations
 
 import glob
 import os
+import re
 import shlex
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# One match per directive: the keyword, then everything up to a comment. The
+# separator may be whitespace or "=", as in OpenSSH.
+_LINE_RE = re.compile(
+    r"^[ \t]*([A-Za-z][A-Za-z0-9]*)(?:[ \t]*=[ \t]*|[ \t]+|(?=#|$))([^#\n]*)",
+    re.MULTILINE,
+)
+# Values containing these need shlex to split tokens or remove quoting.
+_NEEDS_SHLEX_RE = re.compile(r"[\s\"'\\]")
+# Host patterns and negations; such entries are not concrete aliases.
+_WILDCARD_RE = re.compile(r"[*?!]")
+# Parsed configs by top-level path, with the mtime_ns of every file and Include
+# directory the parse depended on (None for paths that did not exist).
+_CONFIG_CACHE: Dict[
+    Path, Tuple[Tuple[Tuple[str, Optional[int]], ...], Dict[str, "SSHHostConfig"]]
+] = {}
 
 
 @dataclass(slots=True)
@@ -18,7 +36,7 @@ class SSHHostConfig:
     hostname: Optional[str] = None
     username: Optional[str] = None
     port: Optional[int] = None
-    identity_files: tuple[str, ...] = ()
+    identity_files: List[str] = field(default_factory=list)
     options: Dict[str, str] = field(default_factory=dict)
 
 
@@ -31,65 +49,126 @@ def load_ssh_config(path: Optional[Path] = None) -> Dict[str, SSHHostConfig]:
     """
 
     config_path = (path or Path.home() / ".ssh/config").expanduser()
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached is not None and all(
+        _mtime_ns(dependency) == mtime for dependency, mtime in cached[0]
+    ):
+        return _copy_hosts(cached[1])
     parser = _SSHConfigParser()
     parser.load(config_path)
-    return parser.hosts
+    _CONFIG_CACHE[config_path] = (tuple(parser.dependencies.items()), parser.hosts)
+    return _copy_hosts(parser.hosts)
+
+
+def _copy_hosts(hosts: Dict[str, SSHHostConfig]) -> Dict[str, SSHHostConfig]:
+    """Copy cached entries so callers cannot mutate the cache through them."""
+
+    return {
+        alias: replace(
+            host, identity_files=list(host.identity_files), options=dict(host.options)
+        )
+        for alias, host in hosts.items()
+    }
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _has_wildcard(pattern: str) -> bool:
+    return any(char in pattern for char in "*?[")
+
+
+def _glob_directories(pattern: str) -> List[str]:
+    """Return the directories whose contents decide what *pattern* matches."""
+
+    parts = pattern.split(os.sep)
+    first = next(index for index, part in enumerate(parts) if _has_wildcard(part))
+    base = os.sep.join(parts[:first]) or (os.sep if os.path.isabs(pattern) else ".")
+    directories = [base]
+    # Every directory matched by a prefix ending in a later component is listed
+    # (or probed) by glob as well, so it can gain matches too.
+    for index in range(first, len(parts) - 1):
+        prefix = os.sep.join(parts[: index + 1])
+        directories.extend(path for path in glob.glob(prefix) if os.path.isdir(path))
+    return directories
 
 
 class _SSHConfigParser:
     def __init__(self) -> None:
         self.hosts: Dict[str, SSHHostConfig] = {}
         self._visited: Set[Path] = set()
+        # Path -> mtime_ns when read, for load_ssh_config's cache check.
+        self.dependencies: Dict[str, Optional[int]] = {}
+        # Include patterns seen during this load, so repeated Includes of the
+        # same fragments do not rescan their directories.
+        self._glob_cache: Dict[str, List[str]] = {}
 
     def load(self, path: Path) -> None:
         resolved = path.expanduser()
         try:
             resolved = resolved.resolve()
         except FileNotFoundError:
+            self.dependencies.setdefault(str(resolved), None)
+            return
+        if resolved in self._visited:
             return
-        if not resolved.exists() or resolved in self._visited:
+        # Stat before reading so a concurrent edit invalidates the cache.
+        mtime = _mtime_ns(str(resolved))
+        self.dependencies.setdefault(str(resolved), mtime)
+        if mtime is None:
             return
         self._visited.add(resolved)
         current_hosts: List[str] = []
-        with resolved.open("r", encoding="utf-8") as handle:
-            for raw_line in handle:
-                line = raw_line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if "#" in line:
-                    line = line.split("#", 1)[0].strip()
-                    if not line:
-                        continue
-                parts = shlex.split(line, comments=False)
-                if not parts:
-                    continue
-                keyword = parts[0].lower()
-                values = parts[1:]
-                if keyword == "match":
-                    current_hosts = []
-                    continue
-                if keyword == "host":
-                    current_hosts = [
-                        value
-                        for value in values
-                        if value
-                        and not any(token in value for token in ("*", "?", "!"))
-                    ]
-                    for alias in current_hosts:
-                        self.hosts.setdefault(alias, SSHHostConfig(alias=alias))
-                    continue
-                if keyword == "include":
-                    self._handle_include(values)
-                    continue
-                if not current_hosts:
-                    continue
+        text = resolved.read_text(encoding="utf-8")
+        for match in _LINE_RE.finditer(text):
+            keyword = match.group(1).lower()
+            raw_value = match.group(2).strip()
+            if not raw_value:
+                values: List[str] = []
+            elif _NEEDS_SHLEX_RE.search(raw_value) is None:
+                values = [raw_value]
+            else:
+                values = shlex.split(raw_value, comments=False)
+            if keyword == "match":
+                current_hosts = []
+                continue
+            if keyword == "host":
+                current_hosts = [
+                    value
+                    for value in values
+                    if value and _WILDCARD_RE.search(value) is None
+                ]
                 for alias in current_hosts:
-                    self._apply(alias, keyword, values)
+                    self.hosts.setdefault(alias, SSHHostConfig(alias=alias))
+                continue
+            if keyword == "include":
+                self._handle_include(values)
+                continue
+            if not current_hosts:
+                continue
+            for alias in current_hosts:
+                self._apply(alias, keyword, values)
 
     def _handle_include(self, values: Iterable[str]) -> None:
         for pattern in values:
             expanded = os.path.expanduser(pattern)
-            for match in glob.glob(expanded):
+            matches = self._glob_cache.get(expanded)
+            if matches is None:
+                if _has_wildcard(expanded):
+                    # New matches show up as a change to a scanned directory.
+                    for directory in _glob_directories(expanded):
+                        self.dependencies.setdefault(directory, _mtime_ns(directory))
+                    matches = glob.glob(expanded)
+                else:
+                    # load() skips a missing file but records it, so creating
+                    # it later invalidates the cache.
+                    matches = [expanded]
+                self._glob_cache[expanded] = matches
+            for match in matches:
                 self.load(Path(match))
 
     def _apply(self, alias: str, keyword: str, values: List[str]) -> None:
@@ -107,9 +186,7 @@ class _SSHConfigParser:
             except ValueError:
                 pass
         elif keyword == "identityfile":
-            files = list(config.identity_files)
-            files.append(os.path.expanduser(value))
-            config.identity_files = tuple(files)
+            config.identity_files.append(os.path.expanduser(value))
         else:
             config.options[keyword] = value
 
@@ -0,0 +1,174 @@
+"""Local stand-ins for the paramiko objects used by ``_RemoteTmuxClient``.
+
+Channels run their command through a local ``sh``, so scripts sent by the
+client execute for real.
+"""
+
+import contextlib
+import os
+import signal
+import subprocess
+import threading
+
+import paramiko
+
+
+class ProcessChannel:
+    """Minimal stand-in for ``paramiko.Channel`` running a local ``sh -c``."""
+
+    def __init__(self, transport: "FakeTransport") -> None:
+        self._transport = transport
+        self.closed = False
+        self.eof_received = False
+        self.command = None
+        self._proc = None
+        self._out = bytearray()
+        self._err = bytearray()
+        self._lock = threading.Lock()
+        self._pumps = []
+        # Readable whenever data is buffered or the process is gone, like the
+        # pipe paramiko exposes through Channel.fileno().
+        self._ready_r, self._ready_w = os.pipe()
+        os.set_blocking(self._ready_r, False)
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        if command == "sh" and self._transport.refuse_shell:
+            raise paramiko.SSHException("shell refused")
+        self.command = command
+        self._proc = subprocess.Popen(
+            ["sh", "-c", command],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            # Own process group, so close() also reaps any children still
+            # holding the pipes.
+            start_new_session=True,
+        )
+        for stream, buffer in (
+            (self._proc.stdout, self._out),
+            (self._proc.stderr, self._err),
+        ):
+            pump = threading.Thread(
+                target=self._pump, args=(stream, buffer), daemon=True
+            )
+            pump.start()
+            self._pumps.append(pump)
+
+    def _pump(self, stream, buffer):
+        while True:
+            data = os.read(stream.fileno(), 65536)
+            with self._lock:
+                if data:
+                    buffer += data
+                elif buffer is self._out:
+                    self.eof_received = True
+                os.write(self._ready_w, b"x")
+            if not data:
+                return
+
+    def fileno(self):
+        return self._ready_r
+
+    def sendall(self, data):
+        if self.closed:
+            raise OSError("channel closed")
+        self._proc.stdin.write(data)
+        self._proc.stdin.flush()
+
+    def shutdown_write(self):
+        self._proc.stdin.close()
+
+    def recv_ready(self):
+        with self._lock:
+            return bool(self._out)
+
+    def recv_stderr_ready(self):
+        with self._lock:
+            return bool(self._err)
+
+    def recv(self, size):
+        return self._take(self._out, size)
+
+    def recv_stderr(self, size):
+        return self._take(self._err, size)
+
+    def _take(self, buffer, size):
+        with self._lock:
+            data = bytes(buffer[:size])
+            del buffer[:size]
+            if not self._out and not self._err and not self.eof_received:
+                try:
+                    while os.read(self._ready_r, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+            return data
+
+    def exit_status_ready(self):
+        return self._proc.poll() is not None and not any(
+            pump.is_alive() for pump in self._pumps
+        )
+
+    def recv_exit_status(self):
+        return self._proc.wait()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self._proc is not None:
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(self._proc.pid, signal.SIGKILL)
+            self._proc.wait()
+            # Let the pumps see EOF before their descriptors can be reused.
+            for pump in self._pumps:
+                pump.join()
+            for stream in (self._proc.stdin, self._proc.stdout, self._proc.stderr):
+                if not stream.closed:
+                    stream.close()
+        os.close(self._ready_r)
+        os.close(self._ready_w)
+
+
+class FakeTransport:
+    def __init__(self, *, refuse_shell: bool = False) -> None:
+        self.refuse_shell = refuse_shell
+        self.channels = []
+
+    def open_session(self, timeout=None):
+        channel = ProcessChannel(self)
+        self.channels.append(channel)
+        return channel
+
+    def is_active(self):
+        return True
+
+    def commands(self):
+        return [channel.command for channel in self.channels]
+
+
+class FakeSSHClient:
+    def __init__(self, transport: FakeTransport) -> None:
+        self._transport = transport
+
+    def get_transport(self):
+        return self._transport
+
+    def close(self):
+        for channel in self._transport.channels:
+            channel.close()
+
+
+def make_client(monkeypatch, transport):
+    """Build a ``_RemoteTmuxClient`` whose SSH connection is *transport*."""
+
+    from tmux_mcp.session_manager import ConnectionProfile, _RemoteTmuxClient
+
+    monkeypatch.setattr(
+        _RemoteTmuxClient, "_connect", lambda self: FakeSSHClient(transport)
+    )
+    profile = ConnectionProfile(name="test", hostname="host", username="user")
+    return _RemoteTmuxClient(profile, timeout=10)
@@ -0,0 +1,79 @@
+"""ConnectionProfile.to_ssh_command adds OpenSSH multiplexing unless disabled."""
+
+import shlex
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from tmux_mcp import session_manager  # noqa: E402
+from tmux_mcp.session_manager import ConnectionProfile  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def control_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    path = tmp_path / ".ssh"
+    session_manager._ensure_control_dir.cache_clear()
+    yield path
+    session_manager._ensure_control_dir.cache_clear()
+
+
+def _options(command):
+    argv = shlex.split(command)
+    return [argv[index + 1] for index, arg in enumerate(argv) if arg == "-o"]
+
+
+def test_multiplexing_options_are_added_by_default(control_dir):
+    command = ConnectionProfile(name="p", hostname="box", username="u").to_ssh_command()
+    assert shlex.split(command)[:3] == ["ssh", "-p", "22"]
+    assert shlex.split(command)[-1] == "u@box"
+    assert _options(command) == [
+        "ControlMaster=auto",
+        "ControlPersist=60",
+        "ControlPath=~/.ssh/tmux_mcp-%C",
+    ]
+    assert control_dir.is_dir()
+    assert control_dir.stat().st_mode & 0o777 == 0o700
+
+
+def test_control_master_no_disables_multiplexing(control_dir):
+    profile = ConnectionProfile(
+        name="p", hostname="box", username="u", ssh_options={"controlmaster": "No"}
+    )
+    assert _options(profile.to_ssh_command()) == ["controlmaster=No"]
+    assert not control_dir.exists()
+
+
+def test_user_options_override_the_defaults(control_dir):
+    profile = ConnectionProfile(
+        name="p",
+        hostname="box",
+        username="u",
+        port=2222,
+        identity_file="/keys/id ed25519",
+        ssh_options={"ControlPath": "/run/cm-%C", "ControlPersist": "10m"},
+    )
+    argv = shlex.split(profile.to_ssh_command())
+    assert argv[:5] == ["ssh", "-p", "2222", "-i", "/keys/id ed25519"]
+    assert _options(profile.to_ssh_command()) == [
+        "ControlPath=/run/cm-%C",
+        "ControlPersist=10m",
+        "ControlMaster=auto",
+    ]
+
+
+def test_control_directory_is_created_once(control_dir, monkeypatch):
+    calls = []
+    makedirs = session_manager.os.makedirs
+
+    def counting_makedirs(*args, **kwargs):
+        calls.append(args)
+        makedirs(*args, **kwargs)
+
+    monkeypatch.setattr(session_manager.os, "makedirs", counting_makedirs)
+    for port in (22, 2222, 22):
+        ConnectionProfile(
+            name="p", hostname="box", username="u", port=port
+        ).to_ssh_command()
+    assert calls == [(str(control_dir),)]
@@ -0,0 +1,115 @@
+"""ConnectionProfileStore.batch writes the encrypted store once, or not at all."""
+
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("paramiko")
+
+from tmux_mcp import session_manager  # noqa: E402
+from tmux_mcp.session_manager import (  # noqa: E402
+    ConnectionProfile,
+    ConnectionProfileStore,
+    KeyProvider,
+)
+
+
+def _profile(name, hostname=None):
+    return ConnectionProfile(
+        name=name, hostname=hostname or f"{name}.example", username="u"
+    )
+
+
+def _hostnames(store):
+    return {name: profile.hostname for name, profile in store.list_profiles().items()}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_manager, "keyring", None)
+    store = ConnectionProfileStore(
+        config_dir=tmp_path / "config",
+        key_provider=KeyProvider(secrets_file=tmp_path / "key"),
+    )
+    store.save_profile(_profile("keep"))
+    return store
+
+
+@pytest.fixture
+def writes(store, monkeypatch):
+    calls = []
+    original = store._store
+
+    def counting_store(data):
+        calls.append(dict(data))
+        original(data)
+
+    monkeypatch.setattr(store, "_store", counting_store)
+    return calls
+
+
+def _reopen(store):
+    return ConnectionProfileStore(
+        config_dir=store.config_dir, key_provider=store.key_provider
+    )
+
+
+def test_batch_commits_every_change_in_one_write(store, writes):
+    with store.batch():
+        store.save_profile(_profile("a"))
+        store.save_profile(_profile("b"))
+        store.delete_profile("keep")
+        # Reads inside the batch see the pending changes.
+        assert set(_hostnames(store)) == {"a", "b"}
+    assert len(writes) == 1
+    assert set(writes[0]) == {"a", "b"}
+    assert _hostnames(_reopen(store)) == {"a": "a.example", "b": "b.example"}
+
+
+def test_nested_batches_write_once_when_the_outermost_exits(store, writes):
+    with store.batch():
+        store.save_profile(_profile("a"))
+        with store.batch():
+            store.save_profile(_profile("b"))
+        assert writes == []
+    assert len(writes) == 1
+    assert set(_hostnames(_reopen(store))) == {"keep", "a", "b"}
+
+
+def test_batch_without_changes_does_not_write(store, writes):
+    with store.batch():
+        store.get_profile("keep")
+    assert writes == []
+
+
+def test_error_in_a_nested_batch_discards_all_pending_changes(store, writes):
+    before = store.path.read_bytes()
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.save_profile(_profile("a"))
+            with store.batch():
+                store.save_profile(_profile("keep", "changed.example"))
+                raise RuntimeError("boom")
+    assert writes == []
+    assert store.path.read_bytes() == before
+    # The cache is dropped, so the next read comes from disk.
+    assert store._cache is None
+    assert _hostnames(store) == {"keep": "keep.example"}
+
+
+def test_failed_write_at_commit_reloads_from_disk(store, monkeypatch):
+    def failing_store(data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_store", failing_store)
+    with pytest.raises(OSError, match="disk full"):
+        with store.batch():
+            store.save_profile(_profile("a"))
+    assert not store._dirty
+    assert _hostnames(store) == {"keep": "keep.example"}
+
+
+def test_writes_outside_a_batch_are_stored_immediately(store, writes):
+    store.save_profile(_profile("a"))
+    store.delete_profile("keep")
+    assert len(writes) == 2
+    assert set(_hostnames(_reopen(store))) == {"a"}
@@ -0,0 +1,114 @@
+"""capture_panes() and batch(): several pane captures in one framed script."""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from fake_ssh import FakeTransport, make_client  # noqa: E402
+from tmux_mcp.session_manager import SessionError, _RemotePane  # noqa: E402
+
+# Stands in for "tmux capture-pane -t ID -p -S -N" on the remote host.
+FAKE_TMUX = """#!/bin/sh
+pane=$3
+case "$pane" in
+  %bad) echo "can't find pane: $pane" >&2; exit 1 ;;
+  %noisy) echo "noise for $pane" >&2; printf 'no newline' ;;
+  %empty) ;;
+  *) printf '%s line 1\\n%s line 2\\nstart %s\\n' "$pane" "$pane" "$6" ;;
+esac
+"""
+
+
+@pytest.fixture(params=["shell", "exec"])
+def client(request, monkeypatch, tmp_path):
+    fake = tmp_path / "tmux"
+    fake.write_text(FAKE_TMUX)
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    remote = make_client(
+        monkeypatch, FakeTransport(refuse_shell=request.param == "exec")
+    )
+    calls = []
+    run_raw = remote._run_raw
+
+    def counting_run_raw(command):
+        calls.append(command)
+        return run_raw(command)
+
+    monkeypatch.setattr(remote, "_run_raw", counting_run_raw)
+    remote.calls = calls
+    yield remote
+    remote.close()
+
+
+def test_capture_panes_splits_output_per_pane_in_one_round_trip(client):
+    captured = client.capture_panes(["%1", "%2", "%empty", "%noisy"], 50)
+    assert captured == {
+        "%1": ["%1 line 1", "%1 line 2", "start -50"],
+        "%2": ["%2 line 1", "%2 line 2", "start -50"],
+        "%empty": [],
+        "%noisy": ["no newline"],
+    }
+    assert len(client.calls) == 1
+
+
+def test_each_pane_keeps_its_own_return_code_and_stderr(client):
+    results = client._capture_results(["%1", "%bad", "%noisy"], 10)
+    assert [result.returncode for result in results.values()] == [0, 1, 0]
+    assert results["%1"].stderr == b""
+    assert results["%bad"].stderr == b"can't find pane: %bad\n"
+    assert results["%bad"].stdout == b""
+    assert results["%noisy"].stderr == b"noise for %noisy\n"
+    assert results["%noisy"].stdout == b"no newline"
+
+
+def test_a_failing_pane_raises_with_its_own_error(client):
+    with pytest.raises(SessionError, match="capture pane '%bad'.*can't find pane"):
+        client.capture_panes(["%1", "%bad"], 10)
+
+
+def test_no_panes_means_no_round_trip(client):
+    assert client.capture_panes([], 10) == {}
+    assert client.calls == []
+
+
+def _cache_window(client, *pane_ids):
+    panes = {}
+    for index, pane_id in enumerate(pane_ids):
+        pane = _RemotePane(client, pane_id)
+        panes[pane_id] = panes[str(index)] = pane
+    client._pane_cache[("s", "w")] = (time.monotonic(), panes)
+    return [panes[pane_id] for pane_id in pane_ids]
+
+
+def test_batch_captures_the_whole_window_once(client):
+    first, second = _cache_window(client, "%1", "%2")
+    with client.batch():
+        assert first.capture_pane(20) == ["%1 line 1", "%1 line 2", "start -20"]
+        assert second.capture_pane(20) == ["%2 line 1", "%2 line 2", "start -20"]
+    assert len(client.calls) == 1
+    assert client._batch_captures == {}
+    # Outside the batch every capture is its own command again.
+    first.capture_pane(20)
+    assert len(client.calls) == 2
+
+
+def test_batch_reports_only_the_requested_pane_failure(client):
+    good, bad = _cache_window(client, "%1", "%bad")
+    with client.batch():
+        assert good.capture_pane(5) == ["%1 line 1", "%1 line 2", "start -5"]
+        with pytest.raises(SessionError, match="can't find pane: %bad"):
+            bad.capture_pane(5)
+    assert len(client.calls) == 1
+
+
+def test_other_tmux_commands_drop_the_batch_snapshot(client):
+    (pane,) = _cache_window(client, "%1")
+    with client.batch():
+        pane.capture_pane(5)
+        client._run_tmux("display-message", "-p", "x")
+        pane.capture_pane(5)
+    assert len(client.calls) == 3
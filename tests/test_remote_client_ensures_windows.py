@@ -0,0 +1,40 @@
+"""ensure_session against a real local tmux server, reached via the fake channel."""
+
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from fake_ssh import FakeTransport, make_client  # noqa: E402
+
+pytestmark = pytest.mark.skipif(shutil.which("tmux") is None, reason="needs tmux")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # A short socket directory keeps tmux under the Unix socket path limit.
+    socket_dir = tempfile.mkdtemp(prefix="tmux-", dir="/tmp")
+    monkeypatch.setenv("TMUX_TMPDIR", socket_dir)
+    remote = make_client(monkeypatch, FakeTransport())
+    yield remote
+    remote.close()
+    subprocess.run(["tmux", "kill-server"], capture_output=True)
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+@pytest.mark.parametrize("window", ["agent", "agent.v2", "build:debug", "a.b:c"])
+def test_ensure_session_creates_each_window_once(client, window):
+    for _ in range(3):
+        client.ensure_session(session_name="work", window_name=window)
+    assert client.list_windows("work") == [window]
+    assert client._window_exists("work", window)
+
+
+def test_existing_window_is_not_matched_by_prefix(client):
+    client.ensure_session(session_name="work", window_name="agent-long")
+    client.ensure_session(session_name="work", window_name="agent")
+    assert client.list_windows("work") == ["agent-long", "agent"]
+    assert not client._window_exists("work", "age")
@@ -0,0 +1,101 @@
+"""The remote tmux client's command framing over the persistent ``sh`` channel.
+
+The paramiko channel is replaced by one backed by a local process, so the real
+sentinel script runs through a real shell.
+"""
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from fake_ssh import FakeTransport, make_client  # noqa: E402
+from tmux_mcp.session_manager import SessionError  # noqa: E402
+
+
+@pytest.fixture(params=["shell", "exec"])
+def transport(request):
+    return FakeTransport(refuse_shell=request.param == "exec")
+
+
+@pytest.fixture
+def client(monkeypatch, transport):
+    remote = make_client(monkeypatch, transport)
+    yield remote
+    remote.close()
+
+
+def test_output_without_trailing_newline_is_returned_verbatim(client):
+    assert client._run_raw("printf 'a\\nb'").stdout == b"a\nb"
+    assert client._run_raw("printf 'a\\n'").stdout == b"a\n"
+    assert client._run_raw("true").stdout == b""
+
+
+def test_stderr_is_kept_apart_from_interleaved_stdout(client):
+    result = client._run_raw(
+        "echo out1; echo err1 >&2; echo out2; printf err2 >&2; printf out3"
+    )
+    assert result.stdout == b"out1\nout2\nout3"
+    assert result.stderr == b"err1\nerr2"
+    assert result.returncode == 0
+
+
+def test_large_interleaved_output_spanning_many_reads(client):
+    result = client._run_raw(
+        "for i in 1 2 3 4; do head -c 100000 /dev/zero | tr '\\0' o; "
+        "head -c 100000 /dev/zero | tr '\\0' e >&2; done"
+    )
+    assert result.stdout == b"o" * 400000
+    assert result.stderr == b"e" * 400000
+
+
+def test_non_zero_exit_codes_are_reported(client):
+    assert client._run_raw("exit 3").returncode == 3
+    result = client._run_raw("echo partial; sh -c 'exit 7'")
+    assert (result.stdout, result.returncode) == (b"partial\n", 7)
+    # The failing command must not take the shell down with it.
+    assert client._run_raw("echo still-here").stdout == b"still-here\n"
+
+
+def test_one_shell_channel_serves_consecutive_commands(client, transport):
+    for index in range(5):
+        assert client._run_raw(f"echo {index}").stdout == f"{index}\n".encode()
+    if transport.refuse_shell:
+        assert len(transport.channels) == 6
+    else:
+        assert transport.commands() == ["sh"]
+
+
+def test_commands_do_not_read_the_shell_input_stream(client):
+    # "cat" would swallow the rest of the script if stdin were inherited.
+    assert client._run_raw("cat").returncode == 0
+    assert client._run_raw("echo next").stdout == b"next\n"
+
+
+def test_dead_shell_fails_the_command_then_falls_back_to_exec(client, transport):
+    if transport.refuse_shell:
+        pytest.skip("needs a shell channel to kill")
+    assert client._run_raw("echo warm").stdout == b"warm\n"
+    # The command may have run partially, so it is reported, not retried.
+    with pytest.raises(SessionError):
+        client._run_raw("kill -9 $$")
+    assert client._shell is None
+    transport.refuse_shell = True
+    result = client._run_raw("printf recovered; exit 4")
+    assert (result.stdout, result.returncode) == (b"recovered", 4)
+    # The replacement shell is refused, so the command goes through exec.
+    assert transport.commands() == ["sh", None, "printf recovered; exit 4"]
+
+
+def test_closed_shell_is_replaced_before_the_next_command(client, transport):
+    if transport.refuse_shell:
+        pytest.skip("needs a shell channel to close")
+    client._run_raw("true")
+    transport.channels[0].close()
+    assert client._run_raw("echo fresh").stdout == b"fresh\n"
+    assert transport.commands() == ["sh", "sh"]
+
+
+def test_tmux_failures_use_the_decoded_stderr(client):
+    result = client._run_raw("echo 'tmux: command not found' >&2; exit 127")
+    with pytest.raises(SessionError, match="tmux binary not found"):
+        client._handle_failure(result, "list panes")
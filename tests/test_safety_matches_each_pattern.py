@@ -0,0 +1,60 @@
+"""Combining the safety patterns must not change what any single pattern matches."""
+
+import re
+
+import pytest
+
+from tmux_mcp.safety import (
+    DESTRUCTIVE_REASON,
+    WARN_REASON,
+    SafetyConfig,
+    SafetyEvaluator,
+)
+
+
+def _evaluator(destructive, warn=()):
+    return SafetyEvaluator(
+        SafetyConfig(destructive_patterns=destructive, warn_patterns=warn)
+    )
+
+
+def test_default_patterns_classify_commands():
+    evaluator = SafetyEvaluator()
+    assert evaluator.evaluate("rm -rf /").reason == DESTRUCTIVE_REASON
+    assert evaluator.evaluate("rm -rf build").reason == WARN_REASON
+    assert evaluator.evaluate("ls -la").reason is None
+
+
+def test_numbered_backreference_still_matches_among_other_patterns():
+    evaluator = _evaluator([r"mkfs\s+", r"(\w+) -rf \1"])
+    assert evaluator.evaluate("foo -rf foo").reason == DESTRUCTIVE_REASON
+    assert evaluator.evaluate("foo -rf bar").reason is None
+
+
+def test_named_groups_may_repeat_across_patterns():
+    evaluator = _evaluator([r"(?P<cmd>mkfs)"], [r"(?P<cmd>git) reset"])
+    assert evaluator.evaluate("mkfs.ext4 /dev/sda").reason == DESTRUCTIVE_REASON
+    assert evaluator.evaluate("git reset --hard").reason == WARN_REASON
+
+
+def test_global_inline_flags_are_accepted():
+    evaluator = _evaluator([r"(?i)DROP TABLE", r"reboot"])
+    assert evaluator.evaluate("drop table users").reason == DESTRUCTIVE_REASON
+    assert evaluator.evaluate("reboot now").reason == DESTRUCTIVE_REASON
+
+
+def test_empty_pattern_lists_match_nothing():
+    assert _evaluator([], []).evaluate("rm -rf /").reason is None
+
+
+def test_invalid_pattern_is_rejected():
+    with pytest.raises(re.error):
+        _evaluator(["("])
+
+
+def test_safe_mode_override_does_not_touch_config():
+    evaluator = SafetyEvaluator()
+    result = evaluator.evaluate("rm -rf /", safe_mode=False)
+    assert result.reason == DESTRUCTIVE_REASON
+    assert result.requires_approval is False
+    assert evaluator.config.safe_mode is True
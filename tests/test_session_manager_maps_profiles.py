@@ -0,0 +1,115 @@
+"""SessionManager.map fans work out over pooled clients, one per profile."""
+
+import threading
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from tmux_mcp import session_manager  # noqa: E402
+from tmux_mcp.session_manager import (  # noqa: E402
+    ConnectionProfile,
+    SessionError,
+    SessionManager,
+)
+
+
+class _FakeClient:
+    def __init__(self, profile, *, timeout):
+        self.profile = profile
+        self.active = True
+        self.closed = False
+
+    def is_active(self):
+        return self.active
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeStore:
+    def __init__(self, *names):
+        self.profiles = {
+            name: ConnectionProfile(name=name, hostname=f"{name}.example", username="u")
+            for name in names
+        }
+
+    def get_profile(self, name):
+        return self.profiles.get(name)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(session_manager, "_RemoteTmuxClient", _FakeClient)
+    return SessionManager(_FakeStore("a", "b", "c", "d"))
+
+
+def test_results_follow_the_requested_order(manager):
+    results = manager.map(["d", "b", "a", "b"], lambda client: client.profile.hostname)
+    assert list(results.items()) == [
+        ("d", "d.example"),
+        ("b", "b.example"),
+        ("a", "a.example"),
+    ]
+
+
+def test_calls_run_concurrently(manager):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait_for_all(client):
+        barrier.wait()
+        return client.profile.name
+
+    assert manager.map(["a", "b", "c"], wait_for_all) == {
+        "a": "a",
+        "b": "b",
+        "c": "c",
+    }
+
+
+def test_first_failure_is_raised_after_every_call_finished(manager):
+    finished = []
+
+    def fail_some(client):
+        name = client.profile.name
+        finished.append(name)
+        if name in {"b", "c"}:
+            raise RuntimeError(f"failed on {name}")
+        return name
+
+    with pytest.raises(RuntimeError, match="failed on b"):
+        manager.map(["a", "b", "c", "d"], fail_some, max_workers=2)
+    assert sorted(finished) == ["a", "b", "c", "d"]
+
+
+def test_unknown_profile_fails_before_any_call(manager):
+    called = []
+    with pytest.raises(SessionError, match="'missing' not found"):
+        manager.map(["a", "missing"], called.append)
+    assert called == []
+
+
+def test_no_profiles_returns_an_empty_mapping(manager):
+    assert manager.map([], lambda client: 1) == {}
+
+
+def test_clients_are_pooled_across_calls(manager):
+    first = manager.map(["a"], lambda client: client)["a"]
+    assert manager.map(["a"], lambda client: client)["a"] is first
+    first.active = False
+    replacement = manager.map(["a"], lambda client: client)["a"]
+    assert replacement is not first and first.closed
+
+
+def test_changed_profile_settings_replace_the_pooled_client(manager):
+    first = manager.map(["a"], lambda client: client)["a"]
+    manager.profile_store.profiles["a"] = ConnectionProfile(
+        name="a",
+        hostname="a.example",
+        username="u",
+        ssh_options={"ProxyCommand": "ssh -W %h:%p jump"},
+    )
+    replacement = manager.map(["a"], lambda client: client)["a"]
+    assert replacement is not first and first.closed
+    manager.shutdown()
+    assert replacement.closed
@@ -0,0 +1,26 @@
+"""Parsed SSH configs are cached, but callers get entries they may mutate."""
+
+from tmux_mcp.ssh_config import load_ssh_config
+
+CONFIG = "Host box\n  IdentityFile /keys/a\n  ServerAliveInterval 15\n"
+
+
+def test_mutating_returned_entries_does_not_change_the_cache(tmp_path):
+    path = tmp_path / "config"
+    path.write_text(CONFIG, encoding="utf-8")
+    first = load_ssh_config(path)
+    first["box"].identity_files.append("/keys/injected")
+    first["box"].options["serveraliveinterval"] = "0"
+    first["box"].hostname = "elsewhere"
+    del first["box"]
+    second = load_ssh_config(path)
+    assert second["box"].identity_files == ["/keys/a"]
+    assert second["box"].options == {"serveraliveinterval": "15"}
+    assert second["box"].hostname is None
+
+
+def test_first_parse_returns_copies_too(tmp_path):
+    path = tmp_path / "config"
+    path.write_text(CONFIG, encoding="utf-8")
+    load_ssh_config(path)["box"].identity_files.clear()
+    assert load_ssh_config(path)["box"].identity_files == ["/keys/a"]
@@ -0,0 +1,88 @@
+"""The regex tokenizer in ``ssh_config`` must split values exactly as shlex did."""
+
+import shlex
+
+import pytest
+
+from tmux_mcp.ssh_config import load_ssh_config
+
+# (config line, keyword, raw value as shlex.split would have received it)
+OPTION_LINES = [
+    ("ServerAliveInterval 15", "serveraliveinterval", "15"),
+    ("  ServerAliveInterval\t15   # keepalive", "serveraliveinterval", "15"),
+    ('ProxyCommand "ssh -W %h:%p bastion"', "proxycommand", '"ssh -W %h:%p bastion"'),
+    ("RemoteCommand 'tmux attach -t main'", "remotecommand", "'tmux attach -t main'"),
+    ("RemoteCommand 'it''s'", "remotecommand", "'it''s'"),
+    ("LocalCommand echo\\ hi there", "localcommand", "echo\\ hi there"),
+    ("LocalCommand a\\\\b", "localcommand", "a\\\\b"),
+    ('SendEnv "LANG LC_*" TERM', "sendenv", '"LANG LC_*" TERM'),
+    ('SetEnv FOO="bar baz"', "setenv", 'FOO="bar baz"'),
+    ('SetEnv FOO="it\\"s"', "setenv", 'FOO="it\\"s"'),
+    ("ProxyJump=jump.example.com", "proxyjump", "jump.example.com"),
+    ("ProxyJump = jump.example.com", "proxyjump", "jump.example.com"),
+    ('ProxyJump="jump host"', "proxyjump", '"jump host"'),
+    ("ProxyJump\t=\t'jump host' other", "proxyjump", "'jump host' other"),
+    ("ControlPath ~/.ssh/cm-%C", "controlpath", "~/.ssh/cm-%C"),
+]
+
+
+def _load(tmp_path, text):
+    path = tmp_path / "config"
+    path.write_text(text, encoding="utf-8")
+    return load_ssh_config(path)
+
+
+@pytest.mark.parametrize("line, keyword, raw_value", OPTION_LINES)
+def test_option_values_match_shlex(tmp_path, line, keyword, raw_value):
+    hosts = _load(tmp_path, f"Host box\n{line}\n")
+    expected = shlex.split(raw_value, comments=False)[0]
+    assert hosts["box"].options[keyword] == expected
+
+
+@pytest.mark.parametrize(
+    "line, raw_value",
+    [
+        (
+            "Host alpha \"beta gamma\" 'delta' web-* !bad",
+            "alpha \"beta gamma\" 'delta'",
+        ),
+        ("Host=alpha beta", "alpha beta"),
+        ("host  alpha\\ one", "alpha\\ one"),
+    ],
+)
+def test_host_aliases_match_shlex(tmp_path, line, raw_value):
+    hosts = _load(tmp_path, f"{line}\n")
+    assert list(hosts) == shlex.split(raw_value, comments=False)
+
+
+def test_well_known_keywords_match_shlex(tmp_path):
+    hosts = _load(
+        tmp_path,
+        "Host box\n"
+        "  HostName=box.example.com\n"
+        "  User 'deploy user'\n"
+        "  Port = 2222\n"
+        '  IdentityFile "/keys/id ed25519"\n'
+        "  IdentityFile /keys/second\\ key\n",
+    )
+    box = hosts["box"]
+    assert box.hostname == "box.example.com"
+    assert box.username == "deploy user"
+    assert box.port == 2222
+    assert box.identity_files == ["/keys/id ed25519", "/keys/second key"]
+
+
+def test_comments_blank_lines_and_match_blocks(tmp_path):
+    hosts = _load(
+        tmp_path,
+        "# leading comment\n"
+        "\n"
+        "Host box # trailing comment\n"
+        "   \n"
+        "  User deploy#inline\n"
+        "Match host other\n"
+        "  User ignored\n",
+    )
+    assert list(hosts) == ["box"]
+    assert hosts["box"].username == "deploy"
+    assert hosts["box"].options == {}
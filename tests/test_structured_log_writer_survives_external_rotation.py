@@ -0,0 +1,87 @@
+"""StructuredLogWriter keeps logging when the audit log is moved or deleted."""
+
+import json
+import os
+import time
+
+from tmux_mcp.logging_utils import LogRecord, StructuredLogWriter
+
+
+def _record(task_id):
+    return LogRecord(
+        task_id=task_id,
+        session="s",
+        window="w",
+        pane="0",
+        command="ls",
+        status="executed",
+    )
+
+
+def _task_ids(path):
+    if not path.exists():
+        return []
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [json.loads(line)["task_id"] for line in lines]
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for the writer"
+        time.sleep(0.01)
+
+
+def test_records_go_to_a_new_file_after_the_log_is_deleted(tmp_path):
+    log_path = tmp_path / "audit.log"
+    writer = StructuredLogWriter(log_path)
+    try:
+        writer.append(_record("before"))
+        _wait_for(lambda: _task_ids(log_path) == ["before"])
+        log_path.unlink()
+        writer.append(_record("after"))
+    finally:
+        writer.close()
+    assert _task_ids(log_path) == ["after"]
+
+
+def test_records_follow_an_external_rename(tmp_path):
+    log_path = tmp_path / "audit.log"
+    moved = tmp_path / "audit.log.old"
+    writer = StructuredLogWriter(log_path)
+    try:
+        writer.append(_record("before"))
+        _wait_for(lambda: _task_ids(log_path) == ["before"])
+        os.rename(log_path, moved)
+        writer.append(_record("after"))
+    finally:
+        writer.close()
+    assert _task_ids(moved) == ["before"]
+    assert _task_ids(log_path) == ["after"]
+
+
+def test_rotation_after_the_log_was_deleted_keeps_writing(tmp_path):
+    log_path = tmp_path / "audit.log"
+    writer = StructuredLogWriter(log_path, max_bytes=600, backups=2)
+    try:
+        writer.append(_record("first"))
+        _wait_for(lambda: _task_ids(log_path) == ["first"])
+        log_path.unlink()
+        for index in range(10):
+            writer.append(_record(f"r{index}"))
+    finally:
+        writer.close()
+    written = _task_ids(log_path)
+    for backup in (tmp_path / "audit.log.1", tmp_path / "audit.log.2"):
+        written = _task_ids(backup) + written
+    assert written[-1] == "r9"
+    assert "first" not in written
+
+
+def test_append_after_close_is_written(tmp_path):
+    log_path = tmp_path / "audit.log"
+    writer = StructuredLogWriter(log_path)
+    writer.append(_record("queued"))
+    writer.close()
+    writer.append(_record("late"))
+    assert _task_ids(log_path) == ["queued", "late"]